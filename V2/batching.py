@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class BatchingPredictor:
+    def __init__(self, predictor, max_batch_size=32, max_wait_ms=5):
+        """
+        Queues sentences from concurrent callers and runs them through
+        predictor.predict_gloss_batch as one padded batch. A batch is flushed
+        when it holds max_batch_size sentences or when its oldest sentence
+        has waited max_wait_ms.
+        """
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._queue_wait = 0.0
+        self._batch_time = 0.0
+        self._occupancy = {}  # batch size -> number of batches
+
+        self._worker = threading.Thread(target=self._run, name="gloss-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, sentence):
+        """Queue a sentence and return a Future for its gloss sequence."""
+        future = Future()
+        self._queue.put((sentence, future, time.perf_counter()))
+        return future
+
+    def predict_gloss(self, sentence, timeout=None):
+        """Convert English text to a gloss sequence, batched with other callers."""
+        return self.submit(sentence).result(timeout)
+
+    def close(self):
+        """Stop the worker after the queued sentences are processed."""
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self):
+        """Per-batch occupancy and latency counters, for tuning the size and wait thresholds."""
+        with self._stats_lock:
+            batches = self._batches or 1
+            requests = self._requests or 1
+            return {
+                'batches': self._batches,
+                'requests': self._requests,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'mean_batch_size': self._requests / batches,
+                'mean_occupancy': self._requests / batches / self.max_batch_size,
+                'mean_queue_wait_ms': self._queue_wait / requests * 1000.0,
+                'mean_batch_time_ms': self._batch_time / batches * 1000.0,
+                'batch_size_histogram': dict(sorted(self._occupancy.items())),
+            }
+
+    def _collect(self, first):
+        """Gather a batch starting with first; returns (batch, stop)."""
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+
+            started = time.perf_counter()
+            try:
+                results = self.predictor.predict_gloss_batch([sentence for sentence, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            finished = time.perf_counter()
+
+            with self._stats_lock:
+                self._batches += 1
+                self._requests += len(batch)
+                self._queue_wait += sum(started - enqueued for _, _, enqueued in batch)
+                self._batch_time += finished - started
+                self._occupancy[len(batch)] = self._occupancy.get(len(batch), 0) + 1
+
+if __name__ == "__main__":
+    import json
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from predict import SignPredictor
+
+    max_batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    max_wait_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    predictor = SignPredictor(
+        "text_to_gloss_tf_model.keras",
+        "tokenizer_eng.json",
+        "tokenizer_gloss.json",
+        r"wlasl_data\WLASL_v0.3.json",
+        r"wlasl_data\new_refined_videos",
+        r"wlasl_data\wlasl_class_list.txt",
+        r"wlasl_data\wlasl_snapshot.sqlite"
+    )
+    batcher = BatchingPredictor(predictor, max_batch_size, max_wait_ms)
+
+    # Simulate 64 concurrent users sending the README test sentences
+    sentences = ["hello i happy", "i want water", "mother help family", "man woman walk",
+                 "what problem", "i eat fish", "chair black", "family cool"] * 50
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        list(pool.map(batcher.predict_gloss, sentences))
+    elapsed = time.perf_counter() - started
+    batcher.close()
+
+    print(f"{len(sentences)} sentences in {elapsed:.2f}s ({len(sentences) / elapsed:.1f}/s)")
+    print(json.dumps(batcher.stats(), indent=4))
@@ -0,0 +1,110 @@
+import json
+import tensorflow as tf # type: ignore
+from tokenization import START_TOKEN, END_TOKEN
+from train_text_to_gloss import FILTERS_PATTERN, build_inference_models
+
+class StringToGlossModule(tf.Module):
+    def __init__(self, model, eng_word_index, gloss_word_index, max_length=20):
+        """
+        Wraps a trained seq2seq model so it maps raw sentences to gloss strings.
+        Lowercasing, filtering, vocabulary lookup, padding, decoding and
+        id-to-gloss conversion all run inside the graph, so a batch of
+        sentences needs a single call and no per-item Python work.
+        """
+        super().__init__()
+        self.max_length = max_length
+        self.start_id = gloss_word_index.get(START_TOKEN)
+        self.end_id = gloss_word_index.get(END_TOKEN, -1)
+        if self.start_id is not None:
+            self.encoder, self.decoder = build_inference_models(model)
+        else:
+            self.model = model
+
+        # Same mapping as tokenization.texts_to_sequences: unknown or out-of-range words become <OOV>
+        # (or are dropped when there is no OOV token), as in training
+        num_words = model.get_layer("encoder_embedding").input_dim
+        words = [word for word, index in eng_word_index.items() if index < num_words]
+        self.oov_id = eng_word_index.get("<OOV>", 0)
+        self.eng_table = tf.lookup.StaticHashTable(
+            tf.lookup.KeyValueTensorInitializer(words, [eng_word_index[word] for word in words], tf.string, tf.int64),
+            default_value=self.oov_id
+        )
+
+        # Special tokens map to "" so they are dropped from the output
+        glosses = [gloss for gloss in gloss_word_index if gloss not in ["<OOV>", "<PAD>", START_TOKEN, END_TOKEN]]
+        self.gloss_table = tf.lookup.StaticHashTable(
+            tf.lookup.KeyValueTensorInitializer(
+                [gloss_word_index[gloss] for gloss in glosses], glosses, tf.int64, tf.string
+            ),
+            default_value=""
+        )
+
+    def _encode(self, sentences):
+        """Raw strings -> [batch, max_length] ids, post-padded and truncated from the front."""
+        text = tf.strings.regex_replace(tf.strings.lower(sentences), FILTERS_PATTERN, " ")
+        ids = self.eng_table.lookup(tf.strings.split(text))
+        ids = tf.ragged.boolean_mask(ids, ids > 0)
+        lengths = ids.row_lengths()
+        keep = tf.ragged.range(lengths) >= tf.expand_dims(lengths - self.max_length, 1)
+        return tf.ragged.boolean_mask(ids, keep).to_tensor(0, shape=[None, self.max_length])
+
+    def _greedy_decode(self, input_padded):
+        """Incremental greedy decoding, stopping once every row has emitted the end token."""
+        batch_size = tf.shape(input_padded)[0]
+        state_h, state_c = self.encoder(input_padded, training=False)
+        tokens = tf.fill([batch_size, 1], tf.constant(self.start_id, tf.int64))
+        finished = tf.zeros([batch_size], tf.bool)
+        outputs = tf.TensorArray(tf.int64, size=self.max_length)
+
+        def step(i, tokens, state_h, state_c, finished, outputs):
+            probs, state_h, state_c = self.decoder([tokens, state_h, state_c], training=False)
+            next_ids = tf.argmax(probs[:, -1, :], axis=-1)
+            finished = finished | tf.equal(next_ids, self.end_id)
+            # Rows that have ended emit padding from here on
+            outputs = outputs.write(i, tf.where(finished, tf.zeros_like(next_ids), next_ids))
+            return i + 1, next_ids[:, None], state_h, state_c, finished, outputs
+
+        _, _, _, _, _, outputs = tf.while_loop(
+            lambda i, tokens, state_h, state_c, finished, outputs: (i < self.max_length) & ~tf.reduce_all(finished),
+            step,
+            [tf.constant(0), tokens, state_h, state_c, finished, outputs]
+        )
+        return tf.transpose(outputs.stack())
+
+    @tf.function(input_signature=[tf.TensorSpec([None], tf.string)])
+    def translate(self, sentences):
+        """[batch] sentences -> [batch] space-separated gloss strings ("" when nothing was predicted)."""
+        input_padded = self._encode(sentences)
+        if self.start_id is not None:
+            gloss_ids = self._greedy_decode(input_padded)
+        else:
+            # Models without start/end markers predict all steps in one pass
+            predictions = self.model([input_padded, tf.zeros_like(input_padded)], training=False)
+            gloss_ids = tf.argmax(predictions, axis=-1)
+        glosses = self.gloss_table.lookup(gloss_ids)
+        glosses = tf.ragged.boolean_mask(glosses, glosses != "")
+        return {"glosses": tf.strings.reduce_join(glosses, axis=1, separator=" ")}
+
+def export_string_model(model, tokenizer_eng_path, tokenizer_gloss_path, output_path, max_length=20):
+    """Build the string-to-gloss module from a model and its JSON tokenizers and save it as a SavedModel."""
+    with open(tokenizer_eng_path, "r") as f:
+        eng_word_index = json.load(f)
+    with open(tokenizer_gloss_path, "r") as f:
+        gloss_word_index = json.load(f)
+
+    module = StringToGlossModule(model, eng_word_index, gloss_word_index, max_length)
+    tf.saved_model.save(module, output_path, signatures={"serving_default": module.translate})
+    return output_path
+
+if __name__ == "__main__":
+    model_path = "text_to_gloss_tf_model.keras"
+    output_path = "text_to_gloss_string_model"
+
+    print("Exporting string-to-gloss SavedModel...")
+    export_string_model(tf.keras.models.load_model(model_path), "tokenizer_eng.json", "tokenizer_gloss.json", output_path)
+
+    loaded = tf.saved_model.load(output_path)
+    sentences = ["hello i happy", "i want water", "mother help family", "man woman walk"]
+    for sentence, glosses in zip(sentences, loaded.translate(tf.constant(sentences))["glosses"].numpy()):
+        print(f"{sentence} -> {glosses.decode('utf-8')}")
+    print(f"SavedModel saved as {output_path}")
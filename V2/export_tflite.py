@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+def sample_shape(shape, sample_length=20):
+    """Concrete shape for one sample of a Keras input: batch 1, and sample_length for other unknown dimensions."""
+    return (1,) + tuple(sample_length if dim is None else dim for dim in shape[1:])
+
+def export_tflite(keras_model, output_path, quantization="float16", sample_length=20):
+    """
+    Convert a Keras model to a quantized .tflite file.
+    quantization: "float16" (weights stored as float16) or "int8" (dynamic-range int8 weights).
+    sample_length fills unknown sequence dimensions of the sample used to match outputs.
+    A sidecar <output_path>.json records which TFLite tensor holds each Keras input and output.
+    """
+    import numpy as np
+    import tensorflow as tf # type: ignore
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization != "int8":
+        raise ValueError(f"Unknown quantization: {quantization}")
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+
+    interpreter = tf.lite.Interpreter(model_path=output_path)
+    interpreter.allocate_tensors()
+    input_details = interpreter.get_input_details()
+    output_details = interpreter.get_output_details()
+
+    # Inputs keep the Keras input name inside the TFLite tensor name
+    inputs = []
+    for tensor in keras_model.inputs:
+        name = tensor.name.split(":")[0]
+        inputs.append(next(detail for detail in input_details if name in detail['name']))
+
+    # Outputs are renamed by the converter, so match them on a sample input instead
+    sample = [np.random.randint(1, 10, size=sample_shape(tensor.shape, sample_length)).astype(detail['dtype'])
+              for tensor, detail in zip(keras_model.inputs, inputs)]
+    expected = keras_model(sample, training=False)
+    expected = expected if isinstance(expected, (list, tuple)) else [expected]
+    # Dynamic dimensions are exported as 1, so size the inputs to the sample first
+    for detail, value in zip(inputs, sample):
+        interpreter.resize_tensor_input(detail['index'], value.shape)
+    interpreter.allocate_tensors()
+    for detail, value in zip(inputs, sample):
+        interpreter.set_tensor(detail['index'], value)
+    interpreter.invoke()
+    output_details = interpreter.get_output_details()
+    outputs = []
+    for value in expected:
+        value = np.asarray(value)
+        candidates = [detail for detail in output_details
+                      if detail['name'] not in outputs and tuple(detail['shape']) == value.shape]
+        best = min(candidates, key=lambda detail: np.abs(interpreter.get_tensor(detail['index']) - value).max())
+        outputs.append(best['name'])
+
+    with open(output_path + ".json", "w") as f:
+        json.dump({
+            "inputs": [detail['name'] for detail in inputs],
+            "outputs": outputs,
+            "quantization": quantization,
+        }, f, indent=4)
+    return output_path
+
+def measure(backend, sentences_path, paths):
+    """Load a SignPredictor with one backend, translate the sentences and report timings and peak RSS."""
+    started = time.perf_counter()
+    from predict import SignPredictor
+    if backend == "tflite":
+        encoder_path, decoder_path = paths["tflite_encoder"], paths["tflite_decoder"]
+    else:
+        encoder_path, decoder_path = paths["keras_encoder"], paths["keras_decoder"]
+    predictor = SignPredictor(
+        paths["model"], paths["tokenizer_eng"], paths["tokenizer_gloss"],
+        paths["wlasl_json"], paths["video_dir"], paths["class_list"], paths["snapshot"],
+        encoder_path, decoder_path
+    )
+    load_time = time.perf_counter() - started
+
+    with open(sentences_path, "r") as f:
+        sentences = json.load(f)
+    predictor.predict_gloss(sentences[0])  # Warm up
+    started = time.perf_counter()
+    predictions = [predictor.predict_gloss(sentence) for sentence in sentences]
+    latency = (time.perf_counter() - started) / len(sentences)
+
+    return {
+        "backend": backend,
+        "load_seconds": load_time,
+        "latency_ms": latency * 1000.0,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "predictions": predictions,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the text-to-gloss model to TFLite and compare it with Keras")
+    parser.add_argument("--quantization", choices=["float16", "int8"], default="float16")
+    parser.add_argument("--sentences", type=int, default=200, help="number of dataset sentences used in the report")
+    parser.add_argument("--measure", choices=["keras", "tflite"], help=argparse.SUPPRESS)
+    parser.add_argument("--sentences-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    paths = {
+        "model": "text_to_gloss_tf_model.keras",
+        "keras_encoder": "text_to_gloss_encoder.keras",
+        "keras_decoder": "text_to_gloss_decoder.keras",
+        "tflite_encoder": "text_to_gloss_encoder.tflite",
+        "tflite_decoder": "text_to_gloss_decoder.tflite",
+        "tokenizer_eng": "tokenizer_eng.json",
+        "tokenizer_gloss": "tokenizer_gloss.json",
+        "wlasl_json": r"wlasl_data\WLASL_v0.3.json",
+        "video_dir": r"wlasl_data\new_refined_videos",
+        "class_list": r"wlasl_data\wlasl_class_list.txt",
+        "snapshot": r"wlasl_data\wlasl_snapshot.sqlite",
+    }
+
+    # Each backend is measured in its own process so RSS figures do not mix
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.sentences_file, paths)))
+        sys.exit(0)
+
+    import tensorflow as tf # type: ignore
+    from train_text_to_gloss import build_inference_models, iter_pairs
+
+    print("Exporting TFLite models...")
+    encoder_model, decoder_model = build_inference_models(tf.keras.models.load_model(paths["model"]))
+    encoder_model.save(paths["keras_encoder"])
+    decoder_model.save(paths["keras_decoder"])
+    # Same sequence length as SignPredictor.max_length
+    export_tflite(encoder_model, paths["tflite_encoder"], args.quantization, sample_length=20)
+    export_tflite(decoder_model, paths["tflite_decoder"], args.quantization, sample_length=20)
+
+    # Sample report sentences from the training data
+    dataset = [english for english, _ in iter_pairs("text_to_gloss_shards")]
+    random.seed(0)
+    sentences = random.sample(dataset, min(args.sentences, len(dataset)))
+    sentences_file = "export_tflite_sentences.json"
+    with open(sentences_file, "w") as f:
+        json.dump(sentences, f)
+
+    results = {}
+    for backend in ["keras", "tflite"]:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", backend, "--sentences-file", sentences_file],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[backend] = json.loads(output.strip().splitlines()[-1])
+    os.remove(sentences_file)
+
+    agreement = sum(
+        keras_glosses == tflite_glosses
+        for keras_glosses, tflite_glosses in zip(results["keras"]["predictions"], results["tflite"]["predictions"])
+    ) / len(sentences)
+
+    sizes = {name: os.path.getsize(paths[name]) / 1e6 for name in
+             ["keras_encoder", "keras_decoder", "tflite_encoder", "tflite_decoder"]}
+    print(f"\nTFLite export report ({args.quantization}, {len(sentences)} sentences)")
+    print(f"{'':10}{'size MB':>10}{'load s':>10}{'ms/sent':>10}{'RSS MB':>10}")
+    for backend in ["keras", "tflite"]:
+        result = results[backend]
+        size = sizes[f"{backend}_encoder"] + sizes[f"{backend}_decoder"]
+        print(f"{backend:10}{size:10.1f}{result['load_seconds']:10.2f}{result['latency_ms']:10.2f}{result['max_rss_mb']:10.1f}")
+    print(f"Gloss-sequence agreement: {agreement:.1%}")
@@ -1,133 +1,319 @@
-import json
-import numpy as np
-import tensorflow as tf # type: ignore
-from tensorflow.keras.preprocessing.sequence import pad_sequences # type: ignore
-import os
-
-class SignPredictor:
-    def __init__(self, model_path, tokenizer_eng_path, tokenizer_gloss_path, wlasl_json_path, video_dir, class_list_path):
-        print("Initializing SignPredictor...")
-        
-        # Load the trained model
-        self.model = tf.keras.models.load_model(model_path)
-        print("Model loaded successfully")
-        
-        # Load tokenizers
-        with open(tokenizer_eng_path, "r") as f:
-            tokenizer_eng_index = json.load(f)
-        with open(tokenizer_gloss_path, "r") as f:
-            tokenizer_gloss_index = json.load(f)
-            
-        # Initialize tokenizers
-        self.tokenizer_eng = tf.keras.preprocessing.text.Tokenizer()
-        self.tokenizer_eng.word_index = tokenizer_eng_index
-        
-        self.tokenizer_gloss = tf.keras.preprocessing.text.Tokenizer()
-        self.tokenizer_gloss.word_index = tokenizer_gloss_index
-        self.gloss_index_to_word = {v: k for k, v in tokenizer_gloss_index.items()}
-        
-        # Add class list loading
-        self.word_to_index = {}
-        print("Loading class list...")
-        with open(class_list_path, 'r') as f:
-            for idx, line in enumerate(f):
-                word = line.strip().lower()
-                word = ' '.join(word.split()[1:]) if word.split()[0].rstrip('.').isdigit() else word
-                word = word.replace('\t', '')
-                self.word_to_index[word] = idx
-        print(f"Loaded {len(self.word_to_index)} words")
-
-        # Load WLASL data
-        with open(wlasl_json_path, "r") as f:
-            self.wlasl_data = json.load(f)
-        
-        self.video_dir = video_dir
-        self.max_length = 20  # Same as training
-        print("Initialization complete")
-
-    def predict_gloss(self, sentence):
-        """Convert English text to WLASL gloss sequence using the trained model."""
-        # Preprocess input
-        input_seq = self.tokenizer_eng.texts_to_sequences([sentence.lower()])
-        input_padded = pad_sequences(input_seq, maxlen=self.max_length, padding="post")
-        
-        # Make prediction
-        predictions = self.model.predict(
-            [input_padded, np.zeros_like(input_padded)],
-            verbose=0
-        )
-        
-        # Convert predictions to gloss sequence
-        gloss_sequence = []
-        for pred in predictions[0]:
-            gloss_index = np.argmax(pred)
-            if gloss_index in self.gloss_index_to_word:
-                gloss = self.gloss_index_to_word[gloss_index]
-                if gloss not in ["<OOV>", "<PAD>"]:  # Skip special tokens
-                    gloss_sequence.append(gloss)
-        
-        return gloss_sequence if gloss_sequence else ["No valid gloss prediction"]
-
-    def get_video_path(self, gloss):
-        """Get video path for a gloss using improved matching."""
-        # Special case for 'represent'
-        if gloss.upper() == "REPRESENT":
-            return os.path.join(self.video_dir, "47387.mp4")
-        
-        # Find the entry for this gloss
-        for entry in self.wlasl_data:
-            if entry['gloss'].upper() == gloss.upper():
-                # Try each instance until we find a video that exists
-                for instance in entry['instances']:
-                    video_id = str(instance['video_id'])
-                    video_path = os.path.join(self.video_dir, f"{video_id}.mp4")
-                    if os.path.exists(video_path):
-                        return video_path
-        return None
-
-    def retrieve_videos(self, sentence):
-        """Get video paths for a sentence."""
-        gloss_sequence = self.predict_gloss(sentence)
-        print(f"Predicted Glosses: {gloss_sequence}")  # Debug output
-        
-        video_paths = []
-        for gloss in gloss_sequence:
-            video_path = self.get_video_path(gloss)
-            if video_path:
-                video_paths.append(video_path)
-                print(f"Found video for gloss '{gloss}': {video_path}")  # Debug output
-            else:
-                print(f"No video found for gloss '{gloss}'")  # Debug output
-                
-        return video_paths
-
-if __name__ == "__main__":
-    # Initialize paths
-    model_path = "text_to_gloss_tf_model.keras"
-    tokenizer_eng_path = "tokenizer_eng.json"
-    tokenizer_gloss_path = "tokenizer_gloss.json"
-    wlasl_json_path = r"wlasl_data\WLASL_v0.3.json"
-    video_dir = r"wlasl_data\new_refined_videos"
-    class_list_path = r"wlasl_data\wlasl_class_list.txt"
-    
-    # Create predictor with new class_list_path parameter
-    predictor = SignPredictor(
-        model_path,
-        tokenizer_eng_path,
-        tokenizer_gloss_path,
-        wlasl_json_path,
-        video_dir,
-        class_list_path
-    )
-    
-    # Interactive testing
-    while True:
-        user_input = input("\nEnter a sentence (or 'q' to quit): ")
-        if user_input.lower() in ["exit", "quit", "q"]:
-            break
-            
-        video_paths = predictor.retrieve_videos(user_input)
-        if video_paths:
-            print("\nFound videos:", video_paths)
-        else:
-            print("\nNo matching videos found.")
+import json
+import logging
+import numpy as np
+import os
+import sys
+import time
+from tokenization import START_TOKEN, END_TOKEN, pad_sequences, texts_to_sequences
+
+# Share the snapshot loader with the app in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metrics import STAGE_SECONDS # noqa: E402
+from snapshot import load_class_list, load_entries, load_snapshot # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+class TFLiteModel:
+    def __init__(self, model_path):
+        """
+        Wraps a .tflite file exported by export_tflite.py so it can be called
+        like the Keras model it came from: model([inputs...]) -> [outputs...].
+        Uses tflite_runtime when installed, so full TensorFlow is not imported.
+        """
+        try:
+            from tflite_runtime.interpreter import Interpreter # type: ignore
+        except ImportError:
+            import tensorflow as tf # type: ignore
+            Interpreter = tf.lite.Interpreter
+        self.interpreter = Interpreter(model_path=model_path)
+        self.interpreter.allocate_tensors()
+
+        input_details = {detail['name']: detail for detail in self.interpreter.get_input_details()}
+        output_details = {detail['name']: detail for detail in self.interpreter.get_output_details()}
+
+        # The export records which TFLite tensor holds each Keras input/output
+        with open(model_path + ".json", "r") as f:
+            order = json.load(f)
+        self.inputs = [input_details[name] for name in order["inputs"]]
+        self.outputs = [output_details[name] for name in order["outputs"]]
+        self.input_shapes = None
+
+    def __call__(self, inputs, training=False):
+        if not isinstance(inputs, (list, tuple)):
+            inputs = [inputs]
+        inputs = [np.asarray(value, dtype=detail['dtype']) for detail, value in zip(self.inputs, inputs)]
+        # Inputs with dynamic batch or sequence dimensions are resized to the arrays actually passed
+        input_shapes = [value.shape for value in inputs]
+        if input_shapes != self.input_shapes:
+            for detail, shape in zip(self.inputs, input_shapes):
+                self.interpreter.resize_tensor_input(detail['index'], shape)
+            self.interpreter.allocate_tensors()
+            self.input_shapes = input_shapes
+
+        for detail, value in zip(self.inputs, inputs):
+            self.interpreter.set_tensor(detail['index'], value)
+        self.interpreter.invoke()
+        return [self.interpreter.get_tensor(detail['index']) for detail in self.outputs]
+
+class SignPredictor:
+    def __init__(self, model_path, tokenizer_eng_path, tokenizer_gloss_path, wlasl_json_path, video_dir, class_list_path,
+                 snapshot_path=None, encoder_path=None, decoder_path=None, beam_width=1, string_model_path=None):
+        logger.info("Initializing SignPredictor...")
+        
+        # Load the trained model, preferring the string-to-gloss SavedModel, then the exported encoder/decoder pair.
+        # .tflite files run on the TFLite interpreter without importing full TensorFlow.
+        self.model = None
+        self.encoder = None
+        self.decoder = None
+        self.string_model = None
+        if string_model_path:
+            # Tokenization and greedy decoding run inside the graph (beam_width is not used)
+            import tensorflow as tf # type: ignore
+            self.string_model = tf.saved_model.load(string_model_path)
+        elif encoder_path and decoder_path and encoder_path.endswith(".tflite"):
+            self.encoder = TFLiteModel(encoder_path)
+            self.decoder = TFLiteModel(decoder_path)
+        elif encoder_path and decoder_path:
+            import tensorflow as tf # type: ignore
+            import train_text_to_gloss # noqa: F401  (registers the custom output layer)
+            self.encoder = tf.keras.models.load_model(encoder_path)
+            self.decoder = tf.keras.models.load_model(decoder_path)
+        else:
+            import tensorflow as tf # type: ignore
+            import train_text_to_gloss # noqa: F401  (registers the custom output layer)
+            self.model = tf.keras.models.load_model(model_path)
+        self.beam_width = beam_width
+        logger.info("Model loaded successfully")
+        
+        # Load tokenizers
+        with open(tokenizer_eng_path, "r") as f:
+            self.tokenizer_eng_index = json.load(f)
+        with open(tokenizer_gloss_path, "r") as f:
+            self.tokenizer_gloss_index = json.load(f)
+        self.gloss_index_to_word = {v: k for k, v in self.tokenizer_gloss_index.items()}
+
+        # Models trained with start/end markers are decoded one gloss at a time
+        self.start_id = self.tokenizer_gloss_index.get(START_TOKEN)
+        self.end_id = self.tokenizer_gloss_index.get(END_TOKEN)
+        if self.string_model is None and self.encoder is None and self.start_id is not None:
+            from train_text_to_gloss import build_inference_models
+            self.encoder, self.decoder = build_inference_models(self.model)
+        
+        # Load the class list and WLASL entries, from the snapshot when it is fresh
+        snapshot = load_snapshot(snapshot_path, wlasl_json_path, video_dir, class_list_path) if snapshot_path else None
+        if snapshot:
+            logger.info("Loading snapshot...")
+            self.word_to_index = snapshot['word_to_index']
+            self.wlasl_entries = snapshot['entries']
+            available = snapshot['available']
+        else:
+            logger.info("Loading class list...")
+            self.word_to_index = load_class_list(class_list_path)
+            self.wlasl_entries = load_entries(wlasl_json_path)
+            available = None
+        logger.info("Loaded %d words", len(self.word_to_index))
+        
+        self.video_dir = video_dir
+        self.max_length = 20  # Same as training
+        self.num_words = min(10000, len(self.tokenizer_eng_index) + 1)  # Same as training (vocabulary_size)
+
+        # Build the gloss -> video path index once so lookups never scan
+        self.video_index = {}
+        self.refresh(available)
+        logger.info("Initialization complete")
+
+    def predict_gloss(self, sentence):
+        """Convert English text to WLASL gloss sequence using the trained model."""
+        return self.predict_gloss_batch([sentence])[0]
+
+    def predict_gloss_batch(self, sentences):
+        """
+        Convert several sentences to gloss sequences with a single model call.
+        Stage timings are recorded in metrics.STAGE_SECONDS.
+        """
+        if self.string_model is not None:
+            import tensorflow as tf # type: ignore
+            with STAGE_SECONDS.time('predict_gloss', 'model'):
+                outputs = self.string_model.translate(tf.constant(sentences))["glosses"].numpy()
+            return [glosses.decode("utf-8").split() or ["No valid gloss prediction"] for glosses in outputs]
+
+        # Preprocess input
+        started = time.perf_counter()
+        input_seqs = texts_to_sequences(self.tokenizer_eng_index, sentences, self.num_words)
+        input_padded = pad_sequences(input_seqs, self.max_length)
+        tokenized = time.perf_counter()
+        STAGE_SECONDS.observe(tokenized - started, 'predict_gloss', 'tokenize')
+        
+        # Make prediction
+        if self.encoder is not None:
+            if self.beam_width > 1:
+                batch_indices = [self._beam_search(row[None, :]) for row in input_padded]
+            else:
+                batch_indices = self._greedy_decode(input_padded)
+        else:
+            # Models without start/end markers predict all steps in one pass
+            predictions = self.model.predict(
+                [input_padded, np.zeros_like(input_padded)],
+                batch_size=len(sentences),
+                verbose=0
+            )
+            batch_indices = np.argmax(predictions, axis=-1)
+        predicted = time.perf_counter()
+        STAGE_SECONDS.observe(predicted - tokenized, 'predict_gloss', 'model')
+        
+        # Convert predictions to gloss sequences
+        gloss_sequences = []
+        for gloss_indices in batch_indices:
+            gloss_sequence = []
+            for gloss_index in gloss_indices:
+                if gloss_index in self.gloss_index_to_word:
+                    gloss = self.gloss_index_to_word[gloss_index]
+                    if gloss not in ["<OOV>", "<PAD>", START_TOKEN, END_TOKEN]:  # Skip special tokens
+                        gloss_sequence.append(gloss)
+            gloss_sequences.append(gloss_sequence if gloss_sequence else ["No valid gloss prediction"])
+        STAGE_SECONDS.observe(time.perf_counter() - predicted, 'predict_gloss', 'decode')
+        
+        return gloss_sequences
+
+    def _greedy_decode(self, input_padded):
+        """Run the encoder once, then emit the most likely gloss per step until every row has ended."""
+        state_h, state_c = self.encoder(input_padded, training=False)
+        tokens = np.full((len(input_padded), 1), self.start_id)
+        finished = np.zeros(len(input_padded), dtype=bool)
+        outputs = [[] for _ in range(len(input_padded))]
+
+        for _ in range(self.max_length):
+            probs, state_h, state_c = self.decoder([tokens, state_h, state_c], training=False)
+            next_ids = np.argmax(probs[:, -1, :], axis=-1)
+            for row, gloss_index in enumerate(next_ids):
+                if finished[row]:
+                    continue
+                if gloss_index == self.end_id:
+                    finished[row] = True
+                else:
+                    outputs[row].append(gloss_index)
+            if finished.all():
+                break
+            tokens = next_ids[:, None]
+        return outputs
+
+    def _beam_search(self, input_row):
+        """Keep the beam_width most likely gloss sequences for one sentence and return the best."""
+        state_h, state_c = self.encoder(input_row, training=False)
+        # Each beam is (log probability, gloss ids, state_h, state_c)
+        beams = [(0.0, [], state_h[0], state_c[0])]
+        completed = []
+
+        for _ in range(self.max_length):
+            tokens = np.array([[beam[1][-1] if beam[1] else self.start_id] for beam in beams])
+            probs, new_h, new_c = self.decoder(
+                [tokens, np.stack([beam[2] for beam in beams]), np.stack([beam[3] for beam in beams])],
+                training=False
+            )
+            log_probs = np.log(np.asarray(probs)[:, -1, :] + 1e-9)
+
+            candidates = []
+            for i, (score, ids, _, _) in enumerate(beams):
+                for gloss_index in np.argsort(log_probs[i])[-self.beam_width:]:
+                    candidates.append((score + log_probs[i][gloss_index], ids + [int(gloss_index)], new_h[i], new_c[i]))
+            candidates.sort(key=lambda beam: beam[0], reverse=True)
+
+            beams = []
+            for beam in candidates[:self.beam_width]:
+                if beam[1][-1] == self.end_id:
+                    completed.append((beam[0] / len(beam[1]), beam[1][:-1]))
+                else:
+                    beams.append(beam)
+            if not beams:
+                break
+
+        # Sequences that never ended still compete, normalized by length like the rest
+        completed.extend((score / len(ids), ids) for score, ids, _, _ in beams)
+        return max(completed, key=lambda beam: beam[0])[1]
+
+    def refresh(self, available=None):
+        """Rebuild the gloss-to-video index from a single listing of video_dir."""
+        if available is None:
+            try:
+                available = set(os.listdir(self.video_dir))
+            except FileNotFoundError:
+                available = set()
+
+        video_index = {}
+        for gloss, video_ids in self.wlasl_entries:
+            gloss = gloss.upper()
+            if gloss in video_index:
+                continue
+            # Keep the first instance that has a file on disk
+            for video_id in video_ids:
+                filename = f"{video_id}.mp4"
+                if filename in available:
+                    video_index[gloss] = os.path.join(self.video_dir, filename)
+                    break
+
+        # Special case for 'represent'
+        video_index["REPRESENT"] = os.path.join(self.video_dir, "47387.mp4")
+
+        self.video_index = video_index
+        return len(video_index)
+
+    def get_video_path(self, gloss):
+        """Get video path for a gloss from the precomputed index."""
+        return self.video_index.get(gloss.upper())
+
+    def retrieve_videos(self, sentence):
+        """Get video paths for a sentence."""
+        gloss_sequence = self.predict_gloss(sentence)
+        logger.debug("Predicted glosses: %s", gloss_sequence)
+        
+        video_paths = []
+        for gloss in gloss_sequence:
+            video_path = self.get_video_path(gloss)
+            if video_path:
+                video_paths.append(video_path)
+                logger.debug("Found video for gloss '%s': %s", gloss, video_path)
+            else:
+                logger.debug("No video found for gloss '%s'", gloss)
+                
+        return video_paths
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    # Initialize paths
+    model_path = "text_to_gloss_tf_model.keras"
+    tokenizer_eng_path = "tokenizer_eng.json"
+    tokenizer_gloss_path = "tokenizer_gloss.json"
+    wlasl_json_path = r"wlasl_data\WLASL_v0.3.json"
+    video_dir = r"wlasl_data\new_refined_videos"
+    class_list_path = r"wlasl_data\wlasl_class_list.txt"
+    snapshot_path = r"wlasl_data\wlasl_snapshot.sqlite"
+    encoder_path = "text_to_gloss_encoder.keras"
+    decoder_path = "text_to_gloss_decoder.keras"
+    string_model_path = "text_to_gloss_string_model"  # Written by export_string_model.py
+    
+    # Create predictor with new class_list_path parameter
+    predictor = SignPredictor(
+        model_path,
+        tokenizer_eng_path,
+        tokenizer_gloss_path,
+        wlasl_json_path,
+        video_dir,
+        class_list_path,
+        snapshot_path,
+        encoder_path if os.path.exists(encoder_path) else None,
+        decoder_path if os.path.exists(decoder_path) else None,
+        string_model_path=string_model_path if os.path.exists(string_model_path) else None
+    )
+    
+    # Interactive testing
+    while True:
+        user_input = input("\nEnter a sentence (or 'q' to quit): ")
+        if user_input.lower() in ["exit", "quit", "q"]:
+            break
+            
+        video_paths = predictor.retrieve_videos(user_input)
+        if video_paths:
+            print("\nFound videos:", video_paths)
+        else:
+            print("\nNo matching videos found.")
@@ -1,96 +1,124 @@
-import json
-import random
-
-def load_wlasl_data(json_path, class_list_path):
-    """Load WLASL dataset and class list."""
-    print("Loading WLASL data...")
-    
-    # Load class list
-    valid_words = set()
-    with open(class_list_path, 'r') as f:
-        for line in f:
-            # Remove number prefix, tabs, and whitespace
-            word = line.strip().lower()
-            word = ' '.join(word.split()[1:]) if word.split()[0].rstrip('.').isdigit() else word
-            word = word.replace('\t', '')
-            valid_words.add(word)
-    
-    # Load WLASL data
-    with open(json_path, "r") as f:
-        data = json.load(f)
-    
-    return data, valid_words
-
-def create_training_pairs(wlasl_data, valid_words):
-    """Create training pairs from actual WLASL data."""
-    dataset = []
-    
-    # Create single word pairs
-    for entry in wlasl_data:
-        gloss = entry["gloss"]
-        # Convert gloss to lowercase for matching
-        english_word = gloss.lower()
-        
-        if english_word in valid_words:
-            # Add direct word-to-gloss mapping
-            dataset.append({
-                "english": english_word,
-                "gloss": gloss.upper()
-            })
-            
-            # Add with "the" prefix
-            dataset.append({
-                "english": f"the {english_word}",
-                "gloss": gloss.upper()
-            })
-            
-            # Add with "a" prefix for appropriate words
-            if english_word[0] not in 'aeiou':
-                dataset.append({
-                    "english": f"a {english_word}",
-                    "gloss": gloss.upper()
-                })
-    
-    # Create some simple phrase combinations
-    glosses = [entry["gloss"] for entry in wlasl_data]
-    for i in range(len(dataset)):
-        if random.random() < 0.3:  # 30% chance to create a combination
-            if i + 1 < len(dataset):
-                # Combine two consecutive entries
-                dataset.append({
-                    "english": f"{dataset[i]['english']} {dataset[i+1]['english']}",
-                    "gloss": f"{dataset[i]['gloss']} {dataset[i+1]['gloss']}"
-                })
-    
-    return dataset
-
-def save_dataset(dataset, output_path):
-    """Save the dataset with examples."""
-    random.shuffle(dataset)
-    
-    with open(output_path, "w") as f:
-        json.dump(dataset, f, indent=4)
-    
-    print("\nExample entries from the dataset:")
-    for i in range(min(5, len(dataset))):
-        print(f"\nEnglish: {dataset[i]['english']}")
-        print(f"Gloss: {dataset[i]['gloss']}")
-
-if __name__ == "__main__":
-    json_path = r"wlasl_data\WLASL_v0.3.json"
-    class_list_path = r"wlasl_data\wlasl_class_list.txt"
-    output_path = "text_to_gloss.json"
-    
-    # Load data
-    wlasl_data, valid_words = load_wlasl_data(json_path, class_list_path)
-    print(f"Loaded {len(wlasl_data)} entries and {len(valid_words)} valid words")
-    
-    # Create dataset
-    print("\nCreating training pairs...")
-    dataset = create_training_pairs(wlasl_data, valid_words)
-    print(f"Generated {len(dataset)} pairs")
-    
-    # Save dataset
-    print("\nSaving dataset...")
-    save_dataset(dataset, output_path)
-    print(f"Dataset saved as {output_path}")
+import glob
+import json
+import os
+import random
+from multiprocessing import Pool
+
+# English templates generated for every gloss; "a {word}" is only used before consonants
+TEMPLATES = ["{word}", "the {word}", "a {word}"]
+
+# Chance that a pair is combined with the next one into a two-word phrase
+COMBINATION_PROBABILITY = 0.3
+
+def load_wlasl_data(json_path, class_list_path):
+    """Load WLASL dataset and class list."""
+    print("Loading WLASL data...")
+    
+    # Load class list
+    valid_words = set()
+    with open(class_list_path, 'r') as f:
+        for line in f:
+            # Remove number prefix, tabs, and whitespace
+            word = line.strip().lower()
+            word = ' '.join(word.split()[1:]) if word.split()[0].rstrip('.').isdigit() else word
+            word = word.replace('\t', '')
+            valid_words.add(word)
+    
+    # Load WLASL data
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    
+    return data, valid_words
+
+def iter_word_pairs(wlasl_data, valid_words):
+    """Yield single-word training pairs from actual WLASL data."""
+    for entry in wlasl_data:
+        gloss = entry["gloss"]
+        # Convert gloss to lowercase for matching
+        english_word = gloss.lower()
+        
+        if english_word in valid_words:
+            for template in TEMPLATES:
+                # Add with "a" prefix only for appropriate words
+                if template.startswith("a ") and english_word[0] in 'aeiou':
+                    continue
+                yield {
+                    "english": template.format(word=english_word),
+                    "gloss": gloss.upper()
+                }
+
+def iter_training_pairs(word_pairs, rng):
+    """Yield the word pairs, each followed at random by a phrase combining it with the next pair."""
+    previous = None
+    for pair in word_pairs:
+        yield pair
+        # Create some simple phrase combinations of consecutive entries
+        if previous is not None and rng.random() < COMBINATION_PROBABILITY:
+            yield {
+                "english": f"{previous['english']} {pair['english']}",
+                "gloss": f"{previous['gloss']} {pair['gloss']}"
+            }
+        previous = pair
+
+def shard_path(output_dir, shard_index, num_shards):
+    return os.path.join(output_dir, f"text_to_gloss-{shard_index:05d}-of-{num_shards:05d}.jsonl")
+
+def write_shard(task):
+    """
+    Generate one shard from its slice of WLASL entries with its own seeded
+    RNG and write it as compact JSONL. Only this shard's pairs are in memory.
+    """
+    entries, valid_words, shard_index, num_shards, output_dir, seed = task
+    rng = random.Random(seed * 1000003 + shard_index)
+    pairs = list(iter_training_pairs(iter_word_pairs(entries, valid_words), rng))
+    rng.shuffle(pairs)
+    path = shard_path(output_dir, shard_index, num_shards)
+    with open(path, "w") as f:
+        for pair in pairs:
+            f.write(json.dumps(pair, separators=(",", ":")) + "\n")
+    return path, len(pairs)
+
+def save_shards(wlasl_data, valid_words, output_dir, num_shards=8, seed=0, processes=None):
+    """
+    Generate the dataset as num_shards JSONL files using a process pool.
+    Each worker gets only its slice of the WLASL entries and generates that
+    shard's pairs itself, seeded from (seed, shard index), so the output is
+    reproducible. Shards from an earlier run are removed first.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(output_dir, "text_to_gloss-*-of-*.jsonl")):
+        os.remove(path)
+
+    entries = [entry for entry in wlasl_data if entry["gloss"].lower() in valid_words]
+    shard_size = -(-len(entries) // num_shards)
+    tasks = (
+        (entries[shard_index * shard_size:(shard_index + 1) * shard_size], valid_words,
+         shard_index, num_shards, output_dir, seed)
+        for shard_index in range(num_shards)
+    )
+    with Pool(processes) as pool:
+        return sorted(pool.imap_unordered(write_shard, tasks))
+
+if __name__ == "__main__":
+    json_path = r"wlasl_data\WLASL_v0.3.json"
+    class_list_path = r"wlasl_data\wlasl_class_list.txt"
+    output_dir = "text_to_gloss_shards"
+    num_shards = 8
+    seed = 0
+    
+    # Load data
+    wlasl_data, valid_words = load_wlasl_data(json_path, class_list_path)
+    print(f"Loaded {len(wlasl_data)} entries and {len(valid_words)} valid words")
+    
+    # Create and save dataset shards
+    print("\nCreating training pairs...")
+    shards = save_shards(wlasl_data, valid_words, output_dir, num_shards, seed)
+    print(f"Generated {sum(count for _, count in shards)} pairs in {len(shards)} shards")
+    
+    print("\nExample entries from the dataset:")
+    with open(shards[0][0], "r") as f:
+        for line in list(f)[:5]:
+            entry = json.loads(line)
+            print(f"\nEnglish: {entry['english']}")
+            print(f"Gloss: {entry['gloss']}")
+    print(f"\nDataset saved in {output_dir}")
@@ -0,0 +1,38 @@
+import numpy as np
+
+# Markers added around every gloss sequence so the decoder knows where to start and stop.
+# Plain words are used because the Keras Tokenizer strips '<' and '>'.
+START_TOKEN = "startseq"
+END_TOKEN = "endseq"
+
+# Characters removed by the Keras Tokenizer before splitting
+FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+_FILTER_TABLE = str.maketrans(FILTERS, ' ' * len(FILTERS))
+
+def texts_to_sequences(word_index, texts, num_words=None, oov_token="<OOV>"):
+    """
+    Same result as Keras Tokenizer(num_words, oov_token=oov_token).texts_to_sequences
+    for a tokenizer rebuilt from its word_index JSON: words that are unknown or
+    whose id is not below num_words become the <OOV> id, as in training, and
+    are dropped only when the tokenizer has no OOV token.
+    """
+    oov_id = word_index.get(oov_token)
+    sequences = []
+    for text in texts:
+        sequence = []
+        for word in text.lower().translate(_FILTER_TABLE).split():
+            index = word_index.get(word)
+            if index is None or (num_words and index >= num_words):
+                index = oov_id
+            if index is not None:
+                sequence.append(index)
+        sequences.append(sequence)
+    return sequences
+
+def pad_sequences(sequences, maxlen):
+    """Same result as Keras pad_sequences(..., padding="post") with its default truncating="pre"."""
+    padded = np.zeros((len(sequences), maxlen), dtype=np.int32)
+    for row, sequence in enumerate(sequences):
+        sequence = sequence[-maxlen:]
+        padded[row, :len(sequence)] = sequence
+    return padded
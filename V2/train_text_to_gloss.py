@@ -1,149 +1,428 @@
-import json
-import tensorflow as tf # type: ignore
-from tensorflow.keras.models import Model # type: ignore
-from tensorflow.keras.layers import Input, Embedding, LSTM, Dense, Dropout, Bidirectional, Concatenate # type: ignore
-from tensorflow.keras.preprocessing.text import Tokenizer # type: ignore
-from tensorflow.keras.preprocessing.sequence import pad_sequences # type: ignore
-import numpy as np
-
-def load_dataset(json_path):
-    """Load and preprocess the dataset."""
-    print("Loading dataset...")
-    with open(json_path, "r") as f:
-        return json.load(f)
-
-def prepare_data(dataset, num_words=10000, max_length=20):
-    """Prepare and tokenize the data."""
-    print("Preparing data...")
-    
-    # Extract text pairs
-    english_texts = [entry["english"].lower() for entry in dataset]
-    gloss_texts = [entry["gloss"].upper() for entry in dataset]
-
-    # Initialize tokenizers
-    tokenizer_eng = Tokenizer(num_words=num_words, oov_token="<OOV>")
-    tokenizer_gloss = Tokenizer(num_words=num_words, oov_token="<OOV>")
-
-    # Fit tokenizers
-    print("Fitting tokenizers...")
-    tokenizer_eng.fit_on_texts(english_texts)
-    tokenizer_gloss.fit_on_texts(gloss_texts)
-
-    # Convert to sequences
-    eng_sequences = tokenizer_eng.texts_to_sequences(english_texts)
-    gloss_sequences = tokenizer_gloss.texts_to_sequences(gloss_texts)
-
-    # Pad sequences
-    eng_padded = pad_sequences(eng_sequences, maxlen=max_length, padding="post")
-    gloss_padded = pad_sequences(gloss_sequences, maxlen=max_length, padding="post")
-
-    print(f"Vocabulary sizes - English: {len(tokenizer_eng.word_index)}, Gloss: {len(tokenizer_gloss.word_index)}")
-    return eng_padded, gloss_padded, tokenizer_eng, tokenizer_gloss
-
-def build_seq2seq_model(num_words, embedding_dim=256, hidden_units=512, max_length=20, dropout_rate=0.3):
-    """Build an improved sequence-to-sequence model."""
-    print("Building model...")
-    
-    # Encoder
-    encoder_inputs = Input(shape=(max_length,))
-    encoder_embedding = Embedding(num_words, embedding_dim)(encoder_inputs)
-    encoder_embedding = Dropout(dropout_rate)(encoder_embedding)
-    
-    # Use bidirectional LSTM for encoder
-    forward_lstm = LSTM(hidden_units, return_state=True)
-    backward_lstm = LSTM(hidden_units, return_state=True, go_backwards=True)
-    
-    # Forward LSTM
-    forward_outputs, forward_h, forward_c = forward_lstm(encoder_embedding)
-    
-    # Backward LSTM
-    backward_outputs, backward_h, backward_c = backward_lstm(encoder_embedding)
-    
-    # Concatenate states using Keras layer
-    state_h = Concatenate()([forward_h, backward_h])
-    state_c = Concatenate()([forward_c, backward_c])
-    encoder_states = [state_h, state_c]
-
-    # Decoder
-    decoder_inputs = Input(shape=(max_length,))
-    decoder_embedding = Embedding(num_words, embedding_dim)(decoder_inputs)
-    decoder_embedding = Dropout(dropout_rate)(decoder_embedding)
-    
-    # Regular LSTM for decoder
-    decoder_lstm = LSTM(hidden_units * 2, return_sequences=True)
-    decoder_outputs = decoder_lstm(decoder_embedding, initial_state=encoder_states)
-    decoder_outputs = Dropout(dropout_rate)(decoder_outputs)
-    
-    # Dense output layer
-    decoder_dense = Dense(num_words, activation="softmax")
-    decoder_outputs = decoder_dense(decoder_outputs)
-
-    # Create and compile model
-    model = Model([encoder_inputs, decoder_inputs], decoder_outputs)
-    model.compile(
-        optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
-        loss="sparse_categorical_crossentropy",
-        metrics=["accuracy"]
-    )
-    
-    return model
-
-if __name__ == "__main__":
-    # Configuration
-    dataset_path = "text_to_gloss.json"
-    max_length = 20
-    num_words = 10000
-    epochs = 1
-    batch_size = 64
-    validation_split = 0.2
-
-    # Load and prepare data
-    dataset = load_dataset(dataset_path)
-    eng_padded, gloss_padded, tokenizer_eng, tokenizer_gloss = prepare_data(
-        dataset, num_words, max_length
-    )
-
-    # Build model
-    model = build_seq2seq_model(num_words, max_length=max_length)
-    print(model.summary())
-
-    # Callbacks
-    callbacks = [
-        tf.keras.callbacks.EarlyStopping(
-            monitor='val_loss',
-            patience=5,
-            restore_best_weights=True
-        ),
-        tf.keras.callbacks.ModelCheckpoint(
-            'best_model.keras',
-            monitor='val_loss',
-            save_best_only=True
-        ),
-        tf.keras.callbacks.ReduceLROnPlateau(
-            monitor='val_loss',
-            factor=0.5,
-            patience=2
-        )
-    ]
-
-    # Train model
-    print("\nStarting training...")
-    history = model.fit(
-        [eng_padded, gloss_padded],
-        gloss_padded,
-        batch_size=batch_size,
-        epochs=epochs,
-        validation_split=validation_split,
-        callbacks=callbacks
-    )
-
-    # Save model and tokenizers
-    print("\nSaving model and tokenizers...")
-    model.save("text_to_gloss_tf_model.keras")
-    
-    with open("tokenizer_eng.json", "w") as f:
-        json.dump(tokenizer_eng.word_index, f)
-    with open("tokenizer_gloss.json", "w") as f:
-        json.dump(tokenizer_gloss.word_index, f)
-
-    print("Training complete. Model and tokenizers saved.")
+import json
+import os
+import time
+import tensorflow as tf # type: ignore
+from tensorflow.keras.models import Model # type: ignore
+from tensorflow.keras.layers import Input, Embedding, LSTM, Dense, Dropout, Bidirectional, Concatenate # type: ignore
+from tensorflow.keras.preprocessing.text import Tokenizer # type: ignore
+from tensorflow.keras.preprocessing.sequence import pad_sequences # type: ignore
+import numpy as np
+from tokenization import START_TOKEN, END_TOKEN, FILTERS
+
+# Regex character class matching the characters the Keras Tokenizer strips
+FILTERS_PATTERN = "[" + "".join("\\" + c if c in "\\[]^-" else c for c in FILTERS) + "]"
+
+def load_dataset(json_path):
+    """Load and preprocess the dataset."""
+    print("Loading dataset...")
+    with open(json_path, "r") as f:
+        return json.load(f)
+
+def iter_pairs(dataset_path):
+    """
+    Stream (english, gloss) pairs from a JSON list, a JSONL file, or a directory
+    of JSONL shards written by prepare_dataset.py, without keeping them in memory.
+    """
+    if os.path.isdir(dataset_path):
+        for name in sorted(os.listdir(dataset_path)):
+            if name.endswith(".jsonl"):
+                yield from iter_pairs(os.path.join(dataset_path, name))
+    elif dataset_path.endswith(".jsonl"):
+        with open(dataset_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["english"], entry["gloss"]
+    else:
+        # A single JSON document has to be parsed in one go
+        for entry in load_dataset(dataset_path):
+            yield entry["english"], entry["gloss"]
+
+def fit_tokenizers(pairs, num_words=10000, chunk_size=10000):
+    """Fit the English and gloss tokenizers in one streaming pass over (english, gloss) pairs."""
+    print("Fitting tokenizers...")
+    tokenizer_eng = Tokenizer(num_words=num_words, oov_token="<OOV>")
+    tokenizer_gloss = Tokenizer(num_words=num_words, oov_token="<OOV>")
+
+    english_texts, gloss_texts = [], []
+    for english, gloss in pairs:
+        english_texts.append(english.lower())
+        gloss_texts.append(f"{START_TOKEN} {gloss.upper()} {END_TOKEN}")
+        if len(english_texts) >= chunk_size:
+            tokenizer_eng.fit_on_texts(english_texts)
+            tokenizer_gloss.fit_on_texts(gloss_texts)
+            english_texts, gloss_texts = [], []
+    tokenizer_eng.fit_on_texts(english_texts)
+    tokenizer_gloss.fit_on_texts(gloss_texts)
+
+    print(f"Vocabulary sizes - English: {len(tokenizer_eng.word_index)}, Gloss: {len(tokenizer_gloss.word_index)}")
+    return tokenizer_eng, tokenizer_gloss
+
+def _lookup_table(tokenizer, num_words):
+    """In-graph word -> id table that gives the same ids as tokenizer.texts_to_sequences."""
+    words = [word for word, index in tokenizer.word_index.items() if index < num_words]
+    ids = [tokenizer.word_index[word] for word in words]
+    return tf.lookup.StaticHashTable(
+        tf.lookup.KeyValueTensorInitializer(tf.constant(words), tf.constant(ids, dtype=tf.int64)),
+        default_value=tokenizer.word_index[tokenizer.oov_token]
+    )
+
+def make_datasets(pairs_fn, tokenizer_eng, tokenizer_gloss, num_words=10000, max_length=20, batch_size=64,
+                  validation_split=0.2, bucket_boundaries=(3, 5, 9, 13), shuffle_buffer=10000):
+    """
+    Build streaming train and validation tf.data pipelines.
+    pairs_fn() must return a fresh iterator of (english, gloss) pairs. Text is
+    tokenized in-graph, examples are batched with others of similar length and
+    padded only to the longest in their batch, and tokenized examples are
+    cached after the first epoch.
+    """
+    eng_table = _lookup_table(tokenizer_eng, num_words)
+    gloss_table = _lookup_table(tokenizer_gloss, num_words)
+
+    def tokenize(text, table):
+        text = tf.strings.regex_replace(tf.strings.lower(text), FILTERS_PATTERN, " ")
+        return table.lookup(tf.strings.split(text))
+
+    def encode(english, gloss):
+        # Same truncation as pad_sequences in prepare_data: keep the last words of long sentences
+        eng_ids = tokenize(english, eng_table)[-max_length:]
+        gloss_ids = tokenize(tf.strings.join([START_TOKEN, tf.strings.upper(gloss), END_TOKEN], " "), gloss_table)
+        # Teacher forcing: the decoder reads "startseq A B" and learns to emit "A B endseq"
+        return (eng_ids, gloss_ids[:-1][:max_length]), gloss_ids[1:][:max_length]
+
+    def split(dataset, validation):
+        # Every n-th example goes to validation, so the split is stable across epochs
+        every = max(2, round(1 / validation_split))
+        dataset = dataset.enumerate().filter(lambda i, _: tf.equal(i % every == 0, validation))
+        return dataset.map(lambda _, example: example)
+
+    def pipeline(validation):
+        dataset = tf.data.Dataset.from_generator(
+            pairs_fn,
+            output_signature=(tf.TensorSpec((), tf.string), tf.TensorSpec((), tf.string))
+        )
+        if validation_split:
+            dataset = split(dataset, validation)
+        dataset = dataset.map(encode, num_parallel_calls=tf.data.AUTOTUNE).cache()
+        if not validation:
+            dataset = dataset.shuffle(shuffle_buffer)
+        dataset = dataset.bucket_by_sequence_length(
+            element_length_func=lambda inputs, target: tf.maximum(tf.shape(inputs[0])[0], tf.shape(inputs[1])[0]),
+            bucket_boundaries=list(bucket_boundaries),
+            bucket_batch_sizes=[batch_size] * (len(bucket_boundaries) + 1)
+        )
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    return pipeline(False), (pipeline(True) if validation_split else None)
+
+def training_throughput(fit, num_examples):
+    """Run fit() and return training examples per second per CPU core."""
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    started = time.perf_counter()
+    fit()
+    return num_examples / (time.perf_counter() - started) / cores
+
+def prepare_data(dataset, num_words=10000, max_length=20):
+    """Prepare and tokenize the data."""
+    print("Preparing data...")
+    
+    # Extract text pairs
+    english_texts = [entry["english"].lower() for entry in dataset]
+    gloss_texts = [f"{START_TOKEN} {entry['gloss'].upper()} {END_TOKEN}" for entry in dataset]
+
+    # Initialize tokenizers
+    tokenizer_eng = Tokenizer(num_words=num_words, oov_token="<OOV>")
+    tokenizer_gloss = Tokenizer(num_words=num_words, oov_token="<OOV>")
+
+    # Fit tokenizers
+    print("Fitting tokenizers...")
+    tokenizer_eng.fit_on_texts(english_texts)
+    tokenizer_gloss.fit_on_texts(gloss_texts)
+
+    # Convert to sequences
+    eng_sequences = tokenizer_eng.texts_to_sequences(english_texts)
+    gloss_sequences = tokenizer_gloss.texts_to_sequences(gloss_texts)
+
+    # Teacher forcing: the decoder reads "startseq A B" and learns to emit "A B endseq"
+    decoder_input_sequences = [sequence[:-1] for sequence in gloss_sequences]
+    decoder_target_sequences = [sequence[1:] for sequence in gloss_sequences]
+
+    # Pad sequences
+    eng_padded = pad_sequences(eng_sequences, maxlen=max_length, padding="post")
+    decoder_input_padded = pad_sequences(decoder_input_sequences, maxlen=max_length, padding="post", truncating="post")
+    decoder_target_padded = pad_sequences(decoder_target_sequences, maxlen=max_length, padding="post", truncating="post")
+
+    print(f"Vocabulary sizes - English: {len(tokenizer_eng.word_index)}, Gloss: {len(tokenizer_gloss.word_index)}")
+    return eng_padded, decoder_input_padded, decoder_target_padded, tokenizer_eng, tokenizer_gloss
+
+def vocabulary_size(tokenizer, num_words=10000):
+    """Number of ids a fitted tokenizer can produce (including padding 0), capped at num_words."""
+    return min(num_words, len(tokenizer.word_index) + 1)
+
+@tf.keras.utils.register_keras_serializable(package="wlasl")
+class SampledSoftmaxDense(tf.keras.layers.Layer):
+    """
+    Softmax output layer that can train on a sample of the vocabulary.
+    Called with targets while training, it adds a sampled-softmax loss over
+    num_sampled classes instead of computing the full softmax. Called with
+    targets outside training, it adds the exact cross-entropy (so val_loss
+    stays comparable). Called without targets it returns full probabilities.
+    """
+    def __init__(self, num_classes, num_sampled=512, **kwargs):
+        super().__init__(**kwargs)
+        self.num_classes = num_classes
+        self.num_sampled = num_sampled
+
+    def build(self, input_shape):
+        self.kernel = self.add_weight(name="kernel", shape=(input_shape[-1], self.num_classes), initializer="glorot_uniform")
+        self.bias = self.add_weight(name="bias", shape=(self.num_classes,), initializer="zeros")
+
+    def call(self, inputs, targets=None, training=None):
+        if targets is None:
+            return tf.nn.softmax(tf.tensordot(inputs, self.kernel, axes=1) + self.bias)
+
+        # Padding positions (id 0) do not count towards the loss
+        labels = tf.reshape(tf.cast(targets, tf.int64), [-1, 1])
+        mask = tf.cast(tf.not_equal(labels[:, 0], 0), inputs.dtype)
+        if training:
+            hidden = tf.reshape(inputs, [-1, tf.shape(inputs)[-1]])
+            losses = tf.nn.sampled_softmax_loss(
+                weights=tf.transpose(self.kernel),
+                biases=self.bias,
+                labels=labels,
+                inputs=hidden,
+                num_sampled=min(self.num_sampled, self.num_classes - 1),
+                num_classes=self.num_classes
+            )
+            self.add_loss(tf.reduce_sum(losses * mask) / tf.maximum(tf.reduce_sum(mask), 1.0))
+            # The full probabilities are never needed while training
+            return tf.zeros_like(inputs[..., :1])
+
+        probabilities = tf.nn.softmax(tf.tensordot(inputs, self.kernel, axes=1) + self.bias)
+        losses = tf.keras.losses.sparse_categorical_crossentropy(tf.reshape(labels, tf.shape(targets)), probabilities)
+        mask = tf.reshape(mask, tf.shape(losses))
+        self.add_loss(tf.reduce_sum(losses * mask) / tf.maximum(tf.reduce_sum(mask), 1.0))
+        return probabilities
+
+    def get_config(self):
+        config = super().get_config()
+        config.update({"num_classes": self.num_classes, "num_sampled": self.num_sampled})
+        return config
+
+def build_seq2seq_model(num_words, embedding_dim=256, hidden_units=512, max_length=20, dropout_rate=0.3,
+                        num_decoder_words=None, num_sampled=0):
+    """
+    Build an improved sequence-to-sequence model.
+    num_words sizes the encoder vocabulary and num_decoder_words (defaulting to
+    num_words) the decoder embedding and output softmax; pass vocabulary_size()
+    of the fitted tokenizers so no capacity is spent on unused ids.
+    With num_sampled > 0 the model also takes the target sequence as a third
+    input and trains with a sampled softmax over that many classes.
+    Padding (id 0) is masked, so a sentence gives the same states whether it
+    is padded to its batch's longest item (tf.data buckets) or to max_length
+    (serving).
+    """
+    print("Building model...")
+    num_decoder_words = num_decoder_words or num_words
+    
+    # Encoder
+    encoder_inputs = Input(shape=(max_length,), name="encoder_inputs")
+    encoder_embedding = Embedding(num_words, embedding_dim, mask_zero=True, name="encoder_embedding")(encoder_inputs)
+    encoder_embedding = Dropout(dropout_rate)(encoder_embedding)
+    
+    # Use bidirectional LSTM for encoder
+    forward_lstm = LSTM(hidden_units, return_state=True, name="encoder_forward_lstm")
+    backward_lstm = LSTM(hidden_units, return_state=True, go_backwards=True, name="encoder_backward_lstm")
+    
+    # Forward LSTM
+    forward_outputs, forward_h, forward_c = forward_lstm(encoder_embedding)
+    
+    # Backward LSTM
+    backward_outputs, backward_h, backward_c = backward_lstm(encoder_embedding)
+    
+    # Concatenate states using Keras layer
+    state_h = Concatenate(name="encoder_state_h")([forward_h, backward_h])
+    state_c = Concatenate(name="encoder_state_c")([forward_c, backward_c])
+    encoder_states = [state_h, state_c]
+
+    # Decoder
+    decoder_inputs = Input(shape=(max_length,), name="decoder_inputs")
+    decoder_embedding = Embedding(num_decoder_words, embedding_dim, mask_zero=True, name="decoder_embedding")(decoder_inputs)
+    decoder_embedding = Dropout(dropout_rate)(decoder_embedding)
+    
+    # Regular LSTM for decoder; its states are returned so inference can decode step by step
+    decoder_lstm = LSTM(hidden_units * 2, return_sequences=True, return_state=True, name="decoder_lstm")
+    decoder_outputs, _, _ = decoder_lstm(decoder_embedding, initial_state=encoder_states)
+    decoder_outputs = Dropout(dropout_rate)(decoder_outputs)
+    
+    if num_sampled:
+        # Sampled softmax computes its own loss from the targets
+        decoder_targets = Input(shape=(max_length,), name="decoder_targets")
+        decoder_dense = SampledSoftmaxDense(num_decoder_words, num_sampled, name="decoder_dense")
+        decoder_outputs = decoder_dense(decoder_outputs, decoder_targets)
+
+        model = Model([encoder_inputs, decoder_inputs, decoder_targets], decoder_outputs)
+        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.001))
+        return model
+
+    # Dense output layer
+    decoder_dense = Dense(num_decoder_words, activation="softmax", name="decoder_dense")
+    decoder_outputs = decoder_dense(decoder_outputs)
+
+    # Create and compile model
+    model = Model([encoder_inputs, decoder_inputs], decoder_outputs)
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+        loss="sparse_categorical_crossentropy",
+        metrics=["accuracy"]
+    )
+    
+    return model
+
+def build_inference_models(model):
+    """
+    Split a trained seq2seq model into an encoder that runs once per sentence
+    and a decoder that advances one gloss per call.
+    Encoder: tokens -> [state_h, state_c]
+    Decoder: [previous gloss id, state_h, state_c] -> [gloss probabilities, state_h, state_c]
+    """
+    # Encoder reuses the trained layers up to the concatenated states
+    encoder_model = Model(
+        model.get_layer("encoder_inputs").input,
+        [model.get_layer("encoder_state_h").output, model.get_layer("encoder_state_c").output],
+        name="text_to_gloss_encoder"
+    )
+
+    # Single-step decoder shares the trained embedding, LSTM and output layers
+    decoder_lstm = model.get_layer("decoder_lstm")
+    token_input = Input(shape=(1,), name="decoder_token")
+    state_h_input = Input(shape=(decoder_lstm.units,), name="decoder_state_h")
+    state_c_input = Input(shape=(decoder_lstm.units,), name="decoder_state_c")
+
+    decoder_embedding = model.get_layer("decoder_embedding")(token_input)
+    decoder_outputs, state_h, state_c = decoder_lstm(decoder_embedding, initial_state=[state_h_input, state_c_input])
+    decoder_outputs = model.get_layer("decoder_dense")(decoder_outputs)
+
+    decoder_model = Model(
+        [token_input, state_h_input, state_c_input],
+        [decoder_outputs, state_h, state_c],
+        name="text_to_gloss_decoder"
+    )
+    return encoder_model, decoder_model
+
+if __name__ == "__main__":
+    # Configuration
+    dataset_path = "text_to_gloss_shards"  # Directory written by prepare_dataset.py (a .json or .jsonl file also works)
+    max_length = 20
+    num_words = 10000
+    epochs = 1
+    batch_size = 64
+    validation_split = 0.2
+    use_tf_data = True  # Stream and length-bucket the data instead of padding it all in memory
+    num_sampled = 0  # > 0 trains with a sampled softmax over this many classes (for large gloss vocabularies)
+    compare_input_pipelines = False  # Report training throughput of both input paths, then exit
+
+    if compare_input_pipelines:
+        dataset = [{"english": english, "gloss": gloss} for english, gloss in iter_pairs(dataset_path)]
+        eng_padded, decoder_input_padded, decoder_target_padded, tokenizer_eng, tokenizer_gloss = prepare_data(
+            dataset, num_words, max_length
+        )
+        train_data, _ = make_datasets(lambda: iter_pairs(dataset_path), tokenizer_eng, tokenizer_gloss,
+                                      num_words, max_length, batch_size, validation_split=0)
+
+        encoder_words = vocabulary_size(tokenizer_eng, num_words)
+        decoder_words = vocabulary_size(tokenizer_gloss, num_words)
+        padded_model = build_seq2seq_model(encoder_words, max_length=max_length, num_decoder_words=decoder_words)
+        padded = training_throughput(lambda: padded_model.fit(
+            [eng_padded, decoder_input_padded], decoder_target_padded, batch_size=batch_size, epochs=1, verbose=0
+        ), len(dataset))
+        streaming_model = build_seq2seq_model(encoder_words, max_length=None, num_decoder_words=decoder_words)
+        streaming_model.fit(train_data.take(1), verbose=0)  # Trace and fill the cache outside the timing
+        streaming = training_throughput(lambda: streaming_model.fit(train_data, epochs=1, verbose=0), len(dataset))
+
+        print(f"\nTraining throughput (examples/s per CPU core), one epoch of {len(dataset)} pairs:")
+        print(f"  padded NumPy arrays: {padded:.1f}")
+        print(f"  tf.data, bucketed:   {streaming:.1f} ({streaming / padded:.2f}x)")
+        raise SystemExit
+
+    # Load and prepare data
+    if use_tf_data:
+        tokenizer_eng, tokenizer_gloss = fit_tokenizers(iter_pairs(dataset_path), num_words)
+        train_data, validation_data = make_datasets(
+            lambda: iter_pairs(dataset_path), tokenizer_eng, tokenizer_gloss,
+            num_words, max_length, batch_size, validation_split
+        )
+        if num_sampled:
+            # The sampled-softmax model also reads the targets as an input
+            train_data, validation_data = [
+                data.map(lambda inputs, target: ((inputs[0], inputs[1], target), target)) if data is not None else None
+                for data in (train_data, validation_data)
+            ]
+        fit_args = {"x": train_data, "validation_data": validation_data}
+    else:
+        dataset = [{"english": english, "gloss": gloss} for english, gloss in iter_pairs(dataset_path)]
+        eng_padded, decoder_input_padded, decoder_target_padded, tokenizer_eng, tokenizer_gloss = prepare_data(
+            dataset, num_words, max_length
+        )
+        fit_args = {
+            "x": [eng_padded, decoder_input_padded] + ([decoder_target_padded] if num_sampled else []),
+            "y": decoder_target_padded,
+            "batch_size": batch_size,
+            "validation_split": validation_split,
+        }
+
+    # Build model sized to the fitted vocabularies; bucketed batches have variable length
+    model = build_seq2seq_model(
+        vocabulary_size(tokenizer_eng, num_words),
+        max_length=None if use_tf_data else max_length,
+        num_decoder_words=vocabulary_size(tokenizer_gloss, num_words),
+        num_sampled=num_sampled
+    )
+    print(model.summary())
+
+    # Callbacks
+    callbacks = [
+        tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss',
+            patience=5,
+            restore_best_weights=True
+        ),
+        tf.keras.callbacks.ModelCheckpoint(
+            'best_model.keras',
+            monitor='val_loss',
+            save_best_only=True
+        ),
+        tf.keras.callbacks.ReduceLROnPlateau(
+            monitor='val_loss',
+            factor=0.5,
+            patience=2
+        )
+    ]
+
+    # Train model
+    print("\nStarting training...")
+    history = model.fit(
+        epochs=epochs,
+        callbacks=callbacks,
+        **fit_args
+    )
+
+    # Save model and tokenizers
+    print("\nSaving model and tokenizers...")
+    model.save("text_to_gloss_tf_model.keras")
+
+    # Export the encoder and single-step decoder used for incremental decoding
+    encoder_model, decoder_model = build_inference_models(model)
+    encoder_model.save("text_to_gloss_encoder.keras")
+    decoder_model.save("text_to_gloss_decoder.keras")
+    
+    with open("tokenizer_eng.json", "w") as f:
+        json.dump(tokenizer_eng.word_index, f)
+    with open("tokenizer_gloss.json", "w") as f:
+        json.dump(tokenizer_gloss.word_index, f)
+
+    # Export the model that takes raw sentences and returns gloss strings
+    from export_string_model import export_string_model
+    export_string_model(model, "tokenizer_eng.json", "tokenizer_gloss.json", "text_to_gloss_string_model", max_length)
+
+    print("Training complete. Model and tokenizers saved.")
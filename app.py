@@ -1,200 +1,497 @@
-import nltk
-import os
-
-# Create a data directory if it doesn't exist
-#if not os.path.exists(os.path.expanduser('~/nltk_data')):
-#    os.makedirs(os.path.expanduser('~/nltk_data'))
-
-# Download required NLTK data
-#try:
-#    nltk.data.find('corpora/wordnet')
-#except LookupError:
-#    nltk.download('wordnet')
-#try:
-#    nltk.data.find('taggers/averaged_perceptron_tagger')
-#except LookupError:
-    #nltk.download('averaged_perceptron_tagger')
-
-from flask import Flask, request, jsonify, send_file, render_template
-from predict import WLASLRetrieval
-from nltk.corpus import wordnet
-import speech_recognition as sr
-
-app = Flask(__name__)
-
-# Initialize the WLASL retriever
-json_path = r"wlasl_data/WLASL_v0.3.json"
-video_dir = r"wlasl_data/new_refined_videos"
-class_list_path = r"wlasl_data/wlasl_class_list.txt"
-
-# Initialize the speech recognizer
-recognizer = sr.Recognizer()
-
-print("Initializing WLASL retriever...")
-retriever = WLASLRetrieval(json_path, video_dir, class_list_path)
-print("Retriever initialized successfully")
-
-def get_synonyms(word):
-    """Get all synonyms for a word"""
-    # Special cases
-    word = word.lower()
-    if word == 'am':
-        return ['represent']
-    elif word == 'hi':
-        return ['hello']
-    elif word == 'is':
-        return ['']
-    elif word == 'the':
-        return ['']
-    elif word == 'and':
-        return ['']
-        
-    synonyms = set()
-    for syn in wordnet.synsets(word):
-        for lemma in syn.lemmas():
-            synonym = lemma.name().lower()
-            if synonym != 'cost':  # Exclude 'cost' from synonyms
-                synonyms.add(synonym)
-    return list(synonyms)
-
-def find_matching_word(word, available_words):
-    """Find a matching word or its synonym in available words"""
-    word = word.lower()
-    # First try exact match
-    if word in available_words:
-        return word
-    
-    # Then try synonyms
-    synonyms = get_synonyms(word)
-    for synonym in synonyms:
-        if synonym in available_words:
-            return synonym
-    
-    return None
-
-@app.route('/')
-def index():
-    """Serve the main page"""
-    return render_template('index.html')
-
-@app.route('/translate', methods=['POST'])
-def translate_text():
-    """
-    Endpoint to translate text to sign language videos
-    Expects JSON: {"text": "your text here"}
-    Returns: {"videos": ["path1", "path2", ...]}
-    """
-    try:
-        data = request.get_json()
-        
-        if not data or 'text' not in data:
-            return jsonify({'error': 'No text provided'}), 400
-            
-        # Clean the text: remove symbols and extra spaces
-        text = ''.join(c for c in data['text'] if c.isalnum() or c.isspace())
-        text = ' '.join(text.split())  # Remove extra spaces
-        
-        # Get available words
-        available_words = set(retriever.word_to_index.keys())
-        
-        # Process each word and find matches including synonyms
-        words = text.lower().split()
-        matched_words = []
-        original_to_matched = {}  # Map original words to their matches
-        
-        for word in words:
-            matched_word = find_matching_word(word, available_words)
-            if matched_word:
-                matched_words.append(matched_word)
-                original_to_matched[word] = matched_word
-        
-        # Get videos for matched words
-        video_paths = []
-        for word in matched_words:
-            paths = retriever.get_video_path(word)
-            if paths:
-                video_paths.append(paths)
-        
-        # Convert video paths to URLs or relative paths as needed
-        videos = [os.path.basename(path) for path in video_paths if path]
-        
-        return jsonify({
-            'text': ' '.join(matched_words),
-            'videos': videos,
-            'count': len(videos),
-            'mappings': original_to_matched  # Include word mappings for frontend
-        })
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/available-words', methods=['GET'])
-def get_available_words():
-    """
-    Endpoint to get list of available words
-    Returns: {"words": ["word1", "word2", ...]}
-    """
-    try:
-        words = list(retriever.word_to_index.keys())
-        return jsonify({
-            'words': words,
-            'count': len(words)
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/videos/<video_id>', methods=['GET'])
-def serve_video(video_id):
-    """
-    Endpoint to serve video files
-    """
-    try:
-        video_path = os.path.join(video_dir, video_id)
-        if not os.path.exists(video_path):
-            return jsonify({'error': 'Video not found'}), 404
-            
-        return send_file(video_path, mimetype='video/mp4')
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/speech-to-text', methods=['POST'])
-def speech_to_text():
-    """
-    Endpoint to convert speech to text
-    Expects: Audio data in the request
-    Returns: {"text": "transcribed text"}
-    """
-    try:
-        if 'audio' not in request.files:
-            return jsonify({'error': 'No audio file provided'}), 400
-
-        audio_file = request.files['audio']
-        
-        # Convert the audio to text
-        with sr.AudioFile(audio_file) as source:
-            audio_data = recognizer.record(source)
-            text = recognizer.recognize_google(audio_data)
-            
-            return jsonify({
-                'success': True,
-                'text': text
-            })
-            
-    except sr.UnknownValueError:
-        return jsonify({
-            'success': False,
-            'error': "Couldn't understand the audio"
-        }), 400
-    except sr.RequestError:
-        return jsonify({
-            'success': False,
-            'error': "Error with the speech recognition service"
-        }), 500
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
-
-if __name__ == '__main__':
-    app.run(debug=True, port=5000) 
+import logging
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+# Create a data directory if it doesn't exist
+#if not os.path.exists(os.path.expanduser('~/nltk_data')):
+#    os.makedirs(os.path.expanduser('~/nltk_data'))
+
+# Download required NLTK data
+#try:
+#    nltk.data.find('corpora/wordnet')
+#except LookupError:
+#    nltk.download('wordnet')
+#try:
+#    nltk.data.find('taggers/averaged_perceptron_tagger')
+#except LookupError:
+    #nltk.download('averaged_perceptron_tagger')
+
+from flask import Flask, Response, request, jsonify, send_file, render_template
+from lazy import Lazy
+from metrics import STAGE_SECONDS, render_counter
+from renditions import choose_rendition, poster_path, rendition_path
+from stitching import SentenceStitcher, StitchError
+from video_files import ContentHashes
+
+# Set WLASL_LOG_LEVEL=DEBUG for per-word matching details
+logging.basicConfig(level=os.environ.get('WLASL_LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+
+# Initialize the WLASL retriever
+json_path = r"wlasl_data/WLASL_v0.3.json"
+video_dir = r"wlasl_data/new_refined_videos"
+class_list_path = r"wlasl_data/wlasl_class_list.txt"
+snapshot_path = r"wlasl_data/wlasl_snapshot.sqlite"
+synonym_index_path = r"wlasl_data/synonym_index.json"
+stitch_cache_dir = r"wlasl_data/stitched_videos"
+manifest_path = r"wlasl_data/video_manifest.json"  # built with `python video_manifest.py`
+rendition_dir = r"wlasl_data/renditions"  # built with `python renditions.py`
+
+# Seconds a /speech-to-text request waits for its result
+SPEECH_TIMEOUT = 30
+
+# Maximum number of texts accepted by /translate/batch
+MAX_BATCH_SIZE = 1000
+
+# Maximum number of clips joined by /sentence-video
+MAX_STITCH_CLIPS = 50
+
+# Cache lifetime for content-addressed video URLs (/videos/<id>?v=<etag>)
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Number of distinct clips listed in the Link header of /translate. Browsers ignore
+# rel=preload on fetch() responses (the page prefetches clips itself); the header is
+# only a hint for proxies or CDNs that turn it into 103 Early Hints or pushes.
+PRELOAD_CLIPS = 3
+
+# Subsystems are built on first use, so a cold start that only serves / or /videos
+# does not load the WLASL data or the speech recognizer (see /warm-up)
+
+def _load_translator():
+    from translator import load_translator
+    # The synonym index is built with `python synonyms.py`
+    return load_translator(json_path, video_dir, class_list_path, snapshot_path, synonym_index_path,
+                           manifest_path, os.environ.get('WLASL_VIDEO_SELECTION', 'first'),
+                           int(os.environ.get('WLASL_FUZZY_DISTANCE', '2')),
+                           int(os.environ.get('WLASL_RESULT_CACHE_SIZE', '4096')),
+                           os.environ.get('WLASL_SHARED_CACHE'))  # e.g. wlasl_data/translation_cache.sqlite
+
+def _load_content_hashes():
+    # Content hashes of the clips, renditions and posters, used as strong ETags
+    return ContentHashes(video_dir, manifest_path, rendition_dir)
+
+def _load_speech_service():
+    # 'google' (online) or 'vosk' (offline, needs a model directory)
+    from speech import SpeechService
+    backend = os.environ.get('WLASL_SPEECH_BACKEND', 'google')
+    return SpeechService(
+        backend,
+        workers=int(os.environ.get('WLASL_SPEECH_WORKERS', '2')),
+        max_queue=int(os.environ.get('WLASL_SPEECH_QUEUE', '4')),
+        max_wait=float(os.environ.get('WLASL_SPEECH_MAX_WAIT', '10')),
+        **({'model_path': os.environ.get('WLASL_VOSK_MODEL', r"wlasl_data/vosk-model")} if backend == 'vosk' else {})
+    )
+
+SUBSYSTEMS = {
+    'translator': Lazy('translator', _load_translator),
+    'content_hashes': Lazy('content_hashes', _load_content_hashes),
+    # Joined sentence videos are cached on disk, least recently used first out
+    'stitcher': Lazy('stitcher', lambda: SentenceStitcher(video_dir, stitch_cache_dir,
+                                                          signatures=get_content_hashes().recorded)),
+    'speech': Lazy('speech', _load_speech_service),
+}
+
+def get_translator():
+    return SUBSYSTEMS['translator'].get()
+
+def get_retriever():
+    return get_translator().retriever
+
+def get_content_hashes():
+    return SUBSYSTEMS['content_hashes'].get()
+
+def warm_up(names=None, background=True):
+    """
+    Loads the given subsystems (default: all) now instead of on first use.
+    Returns the threads when loading in the background.
+    """
+    subsystems = [SUBSYSTEMS[name] for name in (names or SUBSYSTEMS)]
+    if background:
+        return [subsystem.load_in_background() for subsystem in subsystems]
+    for subsystem in subsystems:
+        subsystem.get()
+    return []
+
+# WLASL_WARM_UP=1 starts loading everything in the background at startup.
+# Under gunicorn.conf.py the app is imported in the master before forking, and a warm-up
+# thread holding a Lazy lock at fork time would deadlock the workers, so it warms up there instead.
+if os.environ.get('WLASL_WARM_UP') == '1' and os.environ.get('WLASL_PRELOAD') != '1':
+    warm_up()
+
+def requested_rendition(args, headers):
+    """
+    Rendition asked for by a request: ?q=small|medium|original, then
+    Save-Data: on, then the viewport width (?w= or the Sec-CH-Viewport-Width
+    and Viewport-Width hints). None means the original clip.
+    """
+    width = args.get('w') or headers.get('Sec-CH-Viewport-Width') or headers.get('Viewport-Width')
+    try:
+        width = int(float(width)) if width else None
+    except ValueError:
+        width = None
+    return choose_rendition(args.get('q'), headers.get('Save-Data', '').lower() == 'on', width)
+
+def video_file(video_id, rendition=None):
+    """
+    Path of a clip in the given rendition, falling back to the original when
+    that rendition has not been rendered. Returns (path, rendition used).
+    """
+    if rendition:
+        path = rendition_path(rendition_dir, video_id, rendition)
+        if os.path.exists(path):
+            return path, rendition
+    return os.path.join(video_dir, video_id), None
+
+# Playlist entries by (filename, rendition), with the video index and hash generation they were
+# built from. Building one stats files, so a cached translation reuses them and touches no file.
+_playlist_cache = (None, None, {})
+
+def playlist_entry(filename, rendition, manifest_videos, content_hashes):
+    """
+    Playlist entry of one clip: content-addressed URL of the rendition, poster
+    URL (None if not rendered), byte size and duration (None without a video
+    manifest). None if the clip is missing.
+    """
+    video_path, used = video_file(filename, rendition)
+    try:
+        stat = os.stat(video_path)
+    except FileNotFoundError:
+        return None
+    poster = poster_path(rendition_dir, filename)
+    info = manifest_videos.get(filename)
+    return {
+        'video': filename,
+        # The rendition is always explicit so the URL does not depend on request headers
+        'url': f"/videos/{filename}?q={used or 'original'}&v={content_hashes.get(video_path, stat)}",
+        'rendition': used or 'original',
+        'poster': (f"/posters/{os.path.basename(poster)}?v={content_hashes.get(poster)}"
+                   if os.path.exists(poster) else None),
+        'size': stat.st_size,
+        'duration': info['duration'] if info else None,
+    }
+
+def build_playlist(clips, rendition=None):
+    """
+    Playlist entries for the clips of a translation (see playlist_entry),
+    each with the input word and the gloss it matched, for labels.
+    Entries are built once per clip and rendition, and again after the
+    retriever is refreshed or the manifest or rendition index change.
+    """
+    global _playlist_cache
+    retriever = get_retriever()
+    content_hashes = get_content_hashes()
+    content_hashes.reload_if_changed()
+    video_index, generation, entries = _playlist_cache
+    if video_index is not retriever.video_index or generation != content_hashes.generation:
+        entries = {}
+        _playlist_cache = (retriever.video_index, content_hashes.generation, entries)
+
+    manifest_videos = retriever.manifest['videos'] if retriever.manifest else {}
+    playlist = []
+    for clip in clips:
+        key = (clip['video'], rendition)
+        if key not in entries:
+            entries[key] = playlist_entry(clip['video'], rendition, manifest_videos, content_hashes)
+        if entries[key]:
+            playlist.append({**entries[key], 'word': clip['word'], 'gloss': clip['gloss']})
+    return playlist
+
+def with_playlist(result, rendition=None):
+    """Adds the clip playlist to a translation result; /translate and /translate/batch both return it."""
+    result['playlist'] = build_playlist(result['clips'], rendition)
+    return result
+
+def preload_header(playlist):
+    """Link header announcing the first distinct clips of a playlist, or None."""
+    preload = list(dict.fromkeys(entry['url'] for entry in playlist))[:PRELOAD_CLIPS]
+    if not preload:
+        return None
+    # The page fetches clips with fetch(), so they are announced as fetch requests
+    return ', '.join(f'<{url}>; rel=preload; as=fetch; crossorigin' for url in preload)
+
+@app.route('/')
+def index():
+    """Serve the main page"""
+    return render_template('index.html')
+
+@app.route('/translate', methods=['POST'])
+def translate_text():
+    """
+    Endpoint to translate text to sign language videos
+    Expects JSON: {"text": "your text here"}
+    Optional: ?q=small|medium|original or ?w=<viewport width>, Save-Data: on
+    Returns: {"videos": ["path1", "path2", ...], "playlist": [{"url": ..., "poster": ..., "size": ..., "duration": ..., "word": ..., "gloss": ...}, ...], ...}
+    The first clips are also listed in a Link: rel=preload header (a hint for proxies).
+    """
+    try:
+        with STAGE_SECONDS.time('translate', 'parse'):
+            data = request.get_json()
+        
+        if not data or 'text' not in data:
+            return jsonify({'error': 'No text provided'}), 400
+            
+        # Clean the text, match words (including synonyms) and get their videos
+        with STAGE_SECONDS.time('translate', 'total'):
+            result = get_translator().translate(data['text'])
+        with STAGE_SECONDS.time('translate', 'playlist'):
+            with_playlist(result, requested_rendition(request.args, request.headers))
+        with STAGE_SECONDS.time('translate', 'serialize'):
+            response = jsonify(result)
+        link = preload_header(result['playlist'])
+        if link:
+            response.headers['Link'] = link
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/translate/batch', methods=['POST'])
+def translate_batch():
+    """
+    Endpoint to translate several texts in one request
+    Expects JSON: {"texts": ["first text", "second text", ...]}
+    Optional: ?q=small|medium|original or ?w=<viewport width>, Save-Data: on
+    Returns: {"results": [<same shape as /translate>, ...], "count": n}
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('texts'), list):
+            return jsonify({'error': 'No texts provided'}), 400
+        if len(data['texts']) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} texts per batch'}), 400
+        if not all(isinstance(text, str) for text in data['texts']):
+            return jsonify({'error': 'Texts must be strings'}), 400
+            
+        rendition = requested_rendition(request.args, request.headers)
+        results = [with_playlist(result, rendition) for result in get_translator().translate_batch(data['texts'])]
+        return jsonify({
+            'results': results,
+            'count': len(results)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/available-words', methods=['GET'])
+def get_available_words():
+    """
+    Endpoint to get list of available words
+    Returns: {"words": ["word1", "word2", ...]}
+    """
+    try:
+        words = list(get_retriever().word_to_index.keys())
+        return jsonify({
+            'words': words,
+            'count': len(words)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def send_cached_file(path, mimetype, route, not_found='Video not found'):
+    """
+    Sends a file with Range (206) and If-None-Match / If-Modified-Since (304)
+    support. URLs with ?v=<etag> are content-addressed and cached as immutable.
+    """
+    try:
+        with STAGE_SECONDS.time(route, 'stat'):
+            stat = os.stat(path)
+    except FileNotFoundError:
+        return jsonify({'error': not_found}), 404
+
+    with STAGE_SECONDS.time(route, 'etag'):
+        etag = get_content_hashes().get(path, stat)
+    immutable = request.args.get('v') == etag
+    with STAGE_SECONDS.time(route, 'send_file'):
+        response = send_file(
+            path,
+            mimetype=mimetype,
+            conditional=True,
+            etag=etag,
+            last_modified=stat.st_mtime,
+            max_age=IMMUTABLE_MAX_AGE if immutable else None
+        )
+    if immutable:
+        response.cache_control.immutable = True
+    else:
+        # The plain URL may point at new content later, so revalidate with the ETag
+        response.cache_control.no_cache = True
+    return response
+
+@app.route('/videos/<video_id>', methods=['GET'])
+def serve_video(video_id):
+    """
+    Endpoint to serve video files
+    Optional: ?q=small|medium|original or ?w=<viewport width>, Save-Data: on
+    (falls back to the original clip when the rendition has not been rendered)
+    Supports Range requests (206) and If-None-Match / If-Modified-Since (304).
+    URLs with ?v=<etag> are content-addressed and cached as immutable.
+    """
+    try:
+        video_path, _ = video_file(video_id, requested_rendition(request.args, request.headers))
+        response = send_cached_file(video_path, 'video/mp4', 'serve_video')
+        if 'q' not in request.args and not isinstance(response, tuple):
+            # Without ?q= the file depends on the client hints
+            response.vary.update(['Save-Data', 'Sec-CH-Viewport-Width', 'Viewport-Width'])
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/posters/<poster_id>', methods=['GET'])
+def serve_poster(poster_id):
+    """
+    Endpoint to serve poster frames (the first frame of a clip as JPEG)
+    Expects: /posters/27184.jpg, built with `python renditions.py`
+    """
+    try:
+        return send_cached_file(os.path.join(rendition_dir, 'posters', poster_id), 'image/jpeg', 'serve_poster', 'Poster not found')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/sentence-video', methods=['GET'])
+def serve_sentence_video():
+    """
+    Endpoint to serve one MP4 joining the clips of a sentence
+    Expects: ?videos=27184.mp4,26530.mp4 (as returned by /translate)
+             or ?glosses=hello,happy
+    """
+    try:
+        if request.args.get('videos'):
+            video_ids = request.args['videos'].split(',')
+        elif request.args.get('glosses'):
+            paths = [get_retriever().get_video_path(gloss) for gloss in request.args['glosses'].split(',')]
+            video_ids = [os.path.basename(path) for path in paths if path]
+        else:
+            return jsonify({'error': 'No videos provided'}), 400
+
+        if not video_ids:
+            return jsonify({'error': 'Video not found'}), 404
+        if len(video_ids) > MAX_STITCH_CLIPS:
+            return jsonify({'error': f'At most {MAX_STITCH_CLIPS} clips per sentence'}), 400
+        if any(os.path.basename(video_id) != video_id or not video_id.endswith('.mp4') for video_id in video_ids):
+            return jsonify({'error': 'Invalid video id'}), 400
+
+        return send_file(SUBSYSTEMS['stitcher'].get().stitch(video_ids), mimetype='video/mp4')
+    except FileNotFoundError:
+        return jsonify({'error': 'Video not found'}), 404
+    except StitchError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/refresh-videos', methods=['POST'])
+def refresh_videos():
+    """
+    Endpoint to rescan the video directory after clips are added
+    Returns: {"glosses": <number of glosses with a video>}
+    """
+    try:
+        retriever = get_retriever()
+        count = retriever.refresh()
+        get_content_hashes().reload()
+        return jsonify({
+            'glosses': count
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """
+    Endpoint to get the translation result cache counters
+    Returns: {"hits": ..., "shared_hits": ..., "misses": ..., ...}
+    """
+    translator = get_translator()
+    if translator.cache is None:
+        return jsonify({'error': 'Result cache is disabled'}), 404
+    return jsonify(translator.cache.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Endpoint for Prometheus scraping
+    Returns: per-stage latency histograms and cache counters in the Prometheus text format
+    """
+    lines = STAGE_SECONDS.render()
+    # Scraping does not load the translator; its counters appear once it is in use
+    translator = get_translator() if SUBSYSTEMS['translator'].loaded else None
+    if translator is not None and translator.cache is not None:
+        stats = translator.cache.stats()
+        lines += render_counter('wlasl_result_cache_hits_total', 'Results served from the in-process cache.', stats['hits'])
+        lines += render_counter('wlasl_result_cache_shared_hits_total', 'Results served from the shared cache.', stats['shared_hits'])
+        lines += render_counter('wlasl_result_cache_misses_total', 'Results computed because no cache had them.', stats['misses'])
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+@app.route('/warm-up', methods=['GET', 'POST'])
+def warm_up_subsystems():
+    """
+    Endpoint to preload subsystems in the background
+    POST starts loading ?subsystems=translator,speech (default: all); GET only reports
+    Returns: {"translator": {"loaded": ..., ...}, ...}
+    """
+    if request.method == 'POST':
+        names = request.args['subsystems'].split(',') if request.args.get('subsystems') else None
+        if names and any(name not in SUBSYSTEMS for name in names):
+            return jsonify({'error': f'Unknown subsystem, expected one of {list(SUBSYSTEMS)}'}), 400
+        warm_up(names)
+    status = {name: subsystem.status() for name, subsystem in SUBSYSTEMS.items()}
+    return jsonify(status), 202 if request.method == 'POST' else 200
+
+@app.route('/speech-to-text', methods=['POST'])
+def speech_to_text():
+    """
+    Endpoint to convert speech to text
+    Expects: Audio data in the request
+    Returns: {"text": "transcribed text"}
+    """
+    import speech_recognition as sr
+    from speech import RecognizerBusy
+    try:
+        if 'audio' not in request.files:
+            return jsonify({'error': 'No audio file provided'}), 400
+
+        audio_bytes = request.files['audio'].read()
+        
+        # Convert the audio to text in the recognizer pool
+        with STAGE_SECONDS.time('speech_to_text', 'total'):
+            text, queue_seconds, recognize_seconds = SUBSYSTEMS['speech'].get().recognize(audio_bytes, SPEECH_TIMEOUT)
+        STAGE_SECONDS.observe(queue_seconds, 'speech_to_text', 'queue')
+        STAGE_SECONDS.observe(recognize_seconds, 'speech_to_text', 'recognize')
+            
+        return jsonify({
+            'success': True,
+            'text': text
+        })
+            
+    except RecognizerBusy as e:
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except FutureTimeoutError:
+        return jsonify({
+            'success': False,
+            'error': "Speech recognition timed out"
+        }), 504
+    except sr.UnknownValueError:
+        return jsonify({
+            'success': False,
+            'error': "Couldn't understand the audio"
+        }), 400
+    except sr.RequestError:
+        return jsonify({
+            'success': False,
+            'error': "Error with the speech recognition service"
+        }), 500
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+if __name__ == '__main__':
+    app.run(debug=True, port=5000) 
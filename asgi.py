@@ -0,0 +1,277 @@
+"""
+ASGI entry point serving the same data as app.py with async I/O:
+    uvicorn asgi:app --workers 4
+Needs `pip install starlette uvicorn python-multipart`. The Flask app in
+app.py stays available (python app.py / gunicorn) for comparison; routes
+not defined here are passed through to it.
+"""
+import asyncio
+import email.utils
+import os
+from concurrent.futures import ThreadPoolExecutor
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+import app as flask_app
+
+# Bytes read per chunk when streaming a clip
+CHUNK_SIZE = 256 * 1024
+
+# Requests of each route handled at once; others wait up to QUEUE_TIMEOUT seconds, then get a 503
+ROUTE_LIMITS = {
+    'translate': int(os.environ.get('WLASL_TRANSLATE_LIMIT', '32')),
+    'available-words': 8,
+    'videos': int(os.environ.get('WLASL_VIDEOS_LIMIT', '256')),
+    'speech-to-text': int(os.environ.get('WLASL_SPEECH_LIMIT', '8')),
+}
+QUEUE_TIMEOUT = 5.0
+
+# Word matching is CPU bound, so it runs off the event loop in a small pool
+matching_executor = ThreadPoolExecutor(int(os.environ.get('WLASL_MATCHING_THREADS', '4')), thread_name_prefix='matching')
+# Blocking file calls (stat, hashing, reads)
+file_executor = ThreadPoolExecutor(int(os.environ.get('WLASL_FILE_THREADS', '16')), thread_name_prefix='files')
+
+
+async def run_in(executor, fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+def _give_back(task, semaphore):
+    """Cancels a pending acquire; if it already got the permit, releases it instead of leaking it."""
+    task.cancel()
+    task.add_done_callback(lambda task: None if task.cancelled() or task.exception() else semaphore.release())
+
+
+async def acquire_permit(semaphore, timeout):
+    """
+    Waits up to timeout seconds for a permit and returns whether it got one.
+    Unlike wait_for(semaphore.acquire()), a permit granted just as the wait
+    times out or the request is cancelled is returned to the semaphore.
+    """
+    task = asyncio.ensure_future(semaphore.acquire())
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    except BaseException:
+        _give_back(task, semaphore)
+        raise
+    if not done:
+        _give_back(task, semaphore)
+        return False
+    return True
+
+
+def limited(name):
+    """
+    Caps the requests of a route running at once. For streamed responses the
+    slot is held until the body has been sent.
+    """
+    semaphore = asyncio.Semaphore(ROUTE_LIMITS[name])
+
+    def decorator(handler):
+        async def wrapper(request):
+            if not await acquire_permit(semaphore, QUEUE_TIMEOUT):
+                return JSONResponse({'error': 'Server busy, try again'}, 503, headers={'Retry-After': '1'})
+
+            released = False
+            def release():
+                nonlocal released
+                if not released:
+                    released = True
+                    semaphore.release()
+
+            try:
+                response = await handler(request)
+            except BaseException:
+                release()
+                raise
+            if not isinstance(response, StreamingResponse):
+                release()
+                return response
+
+            body = response.body_iterator
+            async def body_then_release():
+                try:
+                    async for chunk in body:
+                        yield chunk
+                finally:
+                    release()
+            response.body_iterator = body_then_release()
+            # Also release if the body is never iterated (client gone before streaming started)
+            response.background = BackgroundTask(release)
+            return response
+        return wrapper
+    return decorator
+
+
+async def index(request):
+    """Serve the main page"""
+    return FileResponse(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'index.html'))
+
+
+def _translate(text, rendition):
+    return flask_app.with_playlist(flask_app.get_translator().translate(text), rendition)
+
+
+@limited('translate')
+async def translate_text(request):
+    """Same as app.translate_text; matching runs in matching_executor."""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or 'text' not in data:
+        return JSONResponse({'error': 'No text provided'}, 400)
+    try:
+        rendition = flask_app.requested_rendition(request.query_params, request.headers)
+        result = await run_in(matching_executor, _translate, data['text'], rendition)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, 500)
+    link = flask_app.preload_header(result['playlist'])
+    return JSONResponse(result, headers={'Link': link} if link else None)
+
+
+@limited('available-words')
+async def get_available_words(request):
+    """Same as app.get_available_words."""
+    try:
+        words = await run_in(matching_executor, lambda: list(flask_app.get_retriever().word_to_index.keys()))
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, 500)
+    return JSONResponse({'words': words, 'count': len(words)})
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single 'bytes=' range, end inclusive; None if there is
+    no usable range header; raises ValueError if the range cannot be satisfied.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[len('bytes='):].strip().partition('-')
+    if not start:
+        if not end or int(end) == 0:
+            raise ValueError(header)
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+async def file_chunks(path, start, length):
+    """Reads [start, start + length) of a file in CHUNK_SIZE pieces without blocking the event loop."""
+    f = await run_in(file_executor, open, path, 'rb')
+    try:
+        await run_in(file_executor, f.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await run_in(file_executor, f.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+@limited('videos')
+async def serve_video(request):
+    """
+    Same as app.serve_video: renditions picked from ?q=, ?w= or Save-Data,
+    Range requests (206), If-None-Match / If-Modified-Since (304) and
+    immutable caching for ?v=<etag> URLs. The file is streamed in chunks.
+    """
+    video_id = request.path_params['video_id']
+    if os.path.basename(video_id) != video_id:
+        return JSONResponse({'error': 'Video not found'}, 404)
+    rendition = flask_app.requested_rendition(request.query_params, request.headers)
+    video_path, _ = await run_in(file_executor, flask_app.video_file, video_id, rendition)
+    try:
+        stat = await run_in(file_executor, os.stat, video_path)
+        etag = await run_in(file_executor, lambda: flask_app.get_content_hashes().get(video_path, stat))
+    except FileNotFoundError:
+        return JSONResponse({'error': 'Video not found'}, 404)
+
+    headers = {
+        'ETag': f'"{etag}"',
+        'Last-Modified': email.utils.formatdate(stat.st_mtime, usegmt=True),
+        'Accept-Ranges': 'bytes',
+        # The plain URL may point at new content later, so revalidate with the ETag
+        'Cache-Control': (f'public, max-age={flask_app.IMMUTABLE_MAX_AGE}, immutable'
+                          if request.query_params.get('v') == etag else 'no-cache'),
+    }
+    if 'q' not in request.query_params:
+        # Without ?q= the file depends on the client hints
+        headers['Vary'] = 'Save-Data, Sec-CH-Viewport-Width, Viewport-Width'
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        tags = {tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')}
+        if etag in tags or '*' in tags:
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get('if-modified-since'):
+        try:
+            since = email.utils.parsedate_to_datetime(request.headers['if-modified-since']).timestamp()
+        except (TypeError, ValueError):
+            since = None  # A malformed date is ignored, as if the header were absent
+        if since is not None and int(stat.st_mtime) <= since:
+            return Response(status_code=304, headers=headers)
+
+    size = stat.st_size
+    # A Range whose If-Range validator no longer matches gets the whole file
+    if_range = request.headers.get('if-range')
+    try:
+        byte_range = parse_range(request.headers.get('range'), size) if not if_range or if_range.strip('"') == etag else None
+    except ValueError:
+        return Response(status_code=416, headers={**headers, 'Content-Range': f'bytes */{size}'})
+
+    start, end = byte_range or (0, size - 1)
+    headers['Content-Length'] = str(end - start + 1)
+    status = 200
+    if byte_range:
+        status = 206
+        headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return StreamingResponse(file_chunks(video_path, start, end - start + 1), status, headers, media_type='video/mp4')
+
+
+@limited('speech-to-text')
+async def speech_to_text(request):
+    """Same as app.speech_to_text; the route waits on the recognizer pool without holding a thread."""
+    import speech_recognition as sr
+    from speech import RecognizerBusy
+
+    form = await request.form()
+    upload = form.get('audio')
+    if upload is None or isinstance(upload, str):
+        return JSONResponse({'error': 'No audio file provided'}, 400)
+    audio_bytes = await upload.read()
+
+    try:
+        service = await run_in(matching_executor, flask_app.SUBSYSTEMS['speech'].get)
+        future = asyncio.wrap_future(service.submit(audio_bytes))
+        text, _, _ = await asyncio.wait_for(future, flask_app.SPEECH_TIMEOUT)
+        return JSONResponse({'success': True, 'text': text})
+    except RecognizerBusy as e:
+        return JSONResponse({'success': False, 'error': str(e)}, 503, headers={'Retry-After': '1'})
+    except asyncio.TimeoutError:
+        return JSONResponse({'success': False, 'error': "Speech recognition timed out"}, 504)
+    except sr.UnknownValueError:
+        return JSONResponse({'success': False, 'error': "Couldn't understand the audio"}, 400)
+    except sr.RequestError:
+        return JSONResponse({'success': False, 'error': "Error with the speech recognition service"}, 500)
+    except Exception as e:
+        return JSONResponse({'success': False, 'error': str(e)}, 500)
+
+
+app = Starlette(routes=[
+    Route('/', index),
+    Route('/translate', translate_text, methods=['POST']),
+    Route('/available-words', get_available_words),
+    Route('/videos/{video_id}', serve_video),
+    Route('/speech-to-text', speech_to_text, methods=['POST']),
+    # Everything else (/translate/batch, /posters, /sentence-video, /metrics, ...) is served by the Flask app
+    Mount('/', app=WSGIMiddleware(flask_app.app)),
+])
@@ -0,0 +1,69 @@
+import argparse
+import json
+from itertools import islice
+from multiprocessing import Pool
+from translator import load_translator
+
+json_path = r"wlasl_data/WLASL_v0.3.json"
+video_dir = r"wlasl_data/new_refined_videos"
+class_list_path = r"wlasl_data/wlasl_class_list.txt"
+snapshot_path = r"wlasl_data/wlasl_snapshot.sqlite"
+synonym_index_path = r"wlasl_data/synonym_index.json"
+manifest_path = r"wlasl_data/video_manifest.json"
+
+# Set in each worker process by init_worker
+translator = None
+
+def init_worker(fuzzy_distance=2):
+    """Loads the translator once per worker process"""
+    global translator
+    translator = load_translator(json_path, video_dir, class_list_path, snapshot_path, synonym_index_path, manifest_path,
+                                 fuzzy_distance=fuzzy_distance)
+
+def translate_chunk(records):
+    """Translates a chunk of records, resolving repeated words once"""
+    results = translator.translate_batch([record['text'] for record in records])
+    for record, result in zip(records, results):
+        if 'id' in record:
+            result['id'] = record['id']
+    return results
+
+def read_records(input_path):
+    """
+    Yields {"text": ...} records from a text file (one sentence per line)
+    or a JSONL file (one {"text": ..., "id": ...} object per line).
+    """
+    is_jsonl = input_path.endswith('.jsonl')
+    with open(input_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line) if is_jsonl else {'text': line}
+
+def chunked(records, size):
+    """Groups records into lists of at most size items"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translate a file of sentences to sign videos")
+    parser.add_argument("input", help="text file with one sentence per line, or a .jsonl file of {\"text\": ...} objects")
+    parser.add_argument("output", help="JSONL file to write one result per input line to")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="sentences sent to a worker at a time")
+    parser.add_argument("--fuzzy-distance", type=int, default=2, help="maximum spelling correction distance (0 disables)")
+    args = parser.parse_args()
+
+    count = 0
+    with Pool(args.workers, initializer=init_worker, initargs=(args.fuzzy_distance,)) as pool, open(args.output, 'w') as out:
+        # imap keeps the input order while streaming, so memory stays bounded
+        for results in pool.imap(translate_chunk, chunked(read_records(args.input), args.chunk_size)):
+            for result in results:
+                out.write(json.dumps(result) + '\n')
+            count += len(results)
+    print(f"Translated {count} sentences to {args.output}")
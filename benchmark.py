@@ -0,0 +1,299 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Benchmarks run against this layout, the same relative paths app.py uses
+JSON_PATH = r"wlasl_data/WLASL_v0.3.json"
+VIDEO_DIR = r"wlasl_data/new_refined_videos"
+CLASS_LIST_PATH = r"wlasl_data/wlasl_class_list.txt"
+SNAPSHOT_PATH = r"wlasl_data/wlasl_snapshot.sqlite"
+SYNONYM_INDEX_PATH = r"wlasl_data/synonym_index.json"
+
+
+def make_words(count, rng):
+    """Unique lowercase pseudo-words, about 2% of them two-word entries."""
+    words = []
+    seen = set()
+    while len(words) < count:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        if rng.random() < 0.02:
+            word += ' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 6)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def make_dataset(root, num_glosses, instances=3, max_videos=20000, video_bytes=64 * 1024, seed=0):
+    """
+    Writes a synthetic WLASL JSON, class list, synonym index and video
+    directory under root/wlasl_data. The first instance of the first
+    max_videos glosses gets a clip of video_bytes random bytes.
+    """
+    from synonyms import SPECIAL_CASES, save_synonym_index
+
+    rng = random.Random(seed)
+    words = make_words(num_glosses, rng)
+    os.makedirs(os.path.join(root, VIDEO_DIR), exist_ok=True)
+
+    entries = []
+    for i, word in enumerate(words):
+        video_ids = [f"{i * instances + k:07d}" for k in range(instances)]
+        entries.append({
+            'gloss': word,
+            'instances': [{'video_id': video_id, 'fps': 25, 'signer_id': k} for k, video_id in enumerate(video_ids)],
+        })
+        if i < max_videos:
+            with open(os.path.join(root, VIDEO_DIR, f"{video_ids[0]}.mp4"), 'wb') as f:
+                f.write(rng.randbytes(video_bytes))
+
+    with open(os.path.join(root, JSON_PATH), 'w') as f:
+        json.dump(entries, f)
+    with open(os.path.join(root, CLASS_LIST_PATH), 'w') as f:
+        for i, word in enumerate(words):
+            f.write(f"{i}\t{word}\n")
+
+    # WordNet is not needed offline: the index only holds the hand-written special cases
+    vocabulary = set(words)
+    save_synonym_index({word: target for word, target in SPECIAL_CASES.items() if word not in vocabulary},
+                       vocabulary, os.path.join(root, SYNONYM_INDEX_PATH))
+    return words
+
+
+def misspell(word, rng):
+    """Replaces one letter, as a user typo would."""
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+
+
+def measure(fn, items):
+    """Calls fn on every item; returns throughput and per-call latency percentiles."""
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        call_started = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'ops': len(items),
+        'ops_per_sec': len(items) / elapsed if elapsed else None,
+        'mean_us': sum(latencies) / len(latencies) * 1e6,
+        'p50_us': latencies[len(latencies) // 2] * 1e6,
+        'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def traced_mb(fn):
+    """Calls fn and returns (result, MB of Python allocations still held)."""
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size / 1e6
+
+
+def forked_private_mb(work, freeze):
+    """
+    Forks a child that runs work() and a garbage collection, like a serving
+    worker, and returns the child's private (unshared) memory in MB.
+    Returns None where fork or /proc/self/smaps_rollup is unavailable.
+    """
+    if not hasattr(os, 'fork') or not os.path.exists('/proc/self/smaps_rollup'):
+        return None
+    gc.collect()
+    if freeze:
+        gc.freeze()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        work()
+        gc.collect()
+        with open('/proc/self/smaps_rollup') as f:
+            private_kb = sum(int(line.split()[1]) for line in f if line.startswith(('Private_Clean', 'Private_Dirty')))
+        os.write(write_fd, str(private_kb).encode())
+        os._exit(0)
+    os.close(write_fd)
+    output = os.read(read_fd, 64)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    if freeze:
+        gc.unfreeze()
+    return int(output) / 1024.0
+
+
+def endpoint_benchmarks(post_translate, get_video, sentences, video_requests):
+    """
+    Times /translate (first pass uncached, second pass cached) and
+    /videos/<video_id>. get_video returns the response body.
+    """
+    translate = {
+        'uncached': measure(post_translate, sentences),
+        'cached': measure(post_translate, sentences),
+    }
+    sizes = []
+    videos = measure(lambda video_id: sizes.append(len(get_video(video_id))), video_requests)
+    seconds = videos['ops'] / videos['ops_per_sec']
+    videos['mb_per_sec'] = sum(sizes) / seconds / 1e6
+    return translate, videos
+
+
+def run_benchmarks(lookups, seed=0):
+    """Runs every benchmark against the dataset in the current directory."""
+    from predict import WLASLRetrieval
+    from snapshot import build_snapshot, load_entries
+    from translator import load_translator
+
+    rng = random.Random(seed)
+    results = {}
+
+    retriever, seconds = timed(lambda: WLASLRetrieval(JSON_PATH, VIDEO_DIR, CLASS_LIST_PATH))
+    results['startup_raw_s'] = seconds
+    _, results['snapshot_build_s'] = timed(lambda: build_snapshot(JSON_PATH, VIDEO_DIR, CLASS_LIST_PATH, SNAPSHOT_PATH))
+    _, results['startup_snapshot_s'] = timed(lambda: WLASLRetrieval(JSON_PATH, VIDEO_DIR, CLASS_LIST_PATH, SNAPSHOT_PATH))
+    translator, results['load_translator_s'] = timed(
+        lambda: load_translator(JSON_PATH, VIDEO_DIR, CLASS_LIST_PATH, SNAPSHOT_PATH, SYNONYM_INDEX_PATH, cache_size=0)
+    )
+    results['glosses'] = len(retriever.word_to_index)
+    results['glosses_with_video'] = len(retriever.video_index)
+
+    words = list(retriever.word_to_index)
+    single_words = [word for word in words if ' ' not in word]
+    results['get_video_path'] = measure(retriever.get_video_path, [rng.choice(words) for _ in range(lookups)])
+
+    # Exact matches, one-letter typos (fuzzy stage) and words that match nothing
+    queries = []
+    for _ in range(lookups // 10):
+        kind = rng.randrange(3)
+        if kind == 0:
+            queries.append(rng.choice(words))
+        elif kind == 1:
+            queries.append(misspell(rng.choice(single_words), rng))
+        else:
+            queries.append(''.join(rng.choice('qxz') for _ in range(8)))
+    results['find_matching_word'] = measure(translator.find_matching_word, queries)
+
+    # Entries as an EntryTable compared with the previous list of (gloss, [video_id, ...]) tuples
+    table, results['entries_table_mb'] = traced_mb(lambda: load_entries(JSON_PATH))
+    _, results['entries_lists_mb'] = traced_mb(lambda: [(gloss, video_ids) for gloss, video_ids in table])
+
+    # Private memory of a forked worker that refreshes the index and translates a few sentences
+    sample = [' '.join(rng.choice(single_words) for _ in range(6)) for _ in range(200)]
+    work = lambda: (translator.retriever.refresh(), [translator.translate(text) for text in sample])
+    compact = translator.retriever.entries
+    translator.retriever.entries = [(gloss, video_ids) for gloss, video_ids in compact]
+    lists_private = forked_private_mb(work, freeze=False)
+    translator.retriever.entries = compact
+    results['worker_private_mb'] = {
+        'entry_lists': lists_private,
+        'entry_table': forked_private_mb(work, freeze=False),
+        'entry_table_gc_freeze': forked_private_mb(work, freeze=True),
+    }
+
+    sentences = [' '.join(rng.choice(single_words) if rng.random() < 0.8 else misspell(rng.choice(single_words), rng)
+                          for _ in range(rng.randint(3, 12))) for _ in range(1000)]
+    video_ids = [os.path.basename(path) for path in retriever.video_index.values()]
+    video_requests = [rng.choice(video_ids) for _ in range(1000)]
+
+    try:
+        import app
+    except ImportError as e:
+        results['translate_endpoint'] = {'skipped': str(e)}
+        results['videos_endpoint'] = {'skipped': str(e)}
+    else:
+        app.warm_up(['translator', 'content_hashes'], background=False)
+        client = app.app.test_client()
+        results['translate_endpoint'], results['videos_endpoint'] = endpoint_benchmarks(
+            lambda text: client.post('/translate', json={'text': text}),
+            lambda video_id: client.get(f'/videos/{video_id}').data,
+            sentences, video_requests
+        )
+
+    # The same requests against the ASGI app, one at a time through its test client
+    try:
+        import asgi
+        from starlette.testclient import TestClient
+    except ImportError as e:
+        results['asgi_translate_endpoint'] = {'skipped': str(e)}
+        results['asgi_videos_endpoint'] = {'skipped': str(e)}
+    else:
+        asgi.flask_app.warm_up(['translator', 'content_hashes'], background=False)
+        with TestClient(asgi.app) as client:
+            results['asgi_translate_endpoint'], results['asgi_videos_endpoint'] = endpoint_benchmarks(
+                lambda text: client.post('/translate', json={'text': text}),
+                lambda video_id: client.get(f'/videos/{video_id}').content,
+                sentences, video_requests
+            )
+
+    results['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks on synthetic WLASL data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000, 200000], help="numbers of glosses")
+    parser.add_argument("--max-videos", type=int, default=20000, help="glosses that get a clip on disk")
+    parser.add_argument("--lookups", type=int, default=100000, help="get_video_path calls (find_matching_word gets a tenth)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Each size runs in a fresh process, inside the dataset directory, so startup and RSS are not shared
+    if args.run:
+        os.chdir(args.run)
+        os.environ['WLASL_LOG_LEVEL'] = 'WARNING'
+        print(json.dumps(run_benchmarks(args.lookups)))
+        sys.exit(0)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': {},
+    }
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix=f"wlasl_bench_{size}_") as root:
+            print(f"Generating {size} glosses...")
+            make_dataset(root, size, max_videos=args.max_videos)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", root, "--lookups", str(args.lookups)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            report['results'][str(size)] = json.loads(output.strip().splitlines()[-1])
+            result = report['results'][str(size)]
+            print(f"  startup {result['startup_raw_s']:.2f}s raw, {result['startup_snapshot_s']:.2f}s snapshot, "
+                  f"get_video_path {result['get_video_path']['mean_us']:.2f}us, "
+                  f"find_matching_word {result['find_matching_word']['mean_us']:.1f}us")
+            print(f"  entries {result['entries_lists_mb']:.1f}MB as lists, {result['entries_table_mb']:.1f}MB as a table; "
+                  f"worker private memory (MB): {result['worker_private_mb']}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"Results saved as {args.output}")
@@ -0,0 +1,104 @@
+# Frequent English words are spelled correctly, but many are an edit or two away from an
+# unrelated sign (was -> wash, were -> where, could -> cold), so they are never corrected.
+# Written the way tokenize() leaves them, so "don't" is "dont".
+COMMON_WORDS = frozenset("""
+    a about above after again against all also am an and any are aren arent as at
+    be became because become been before being below between both but by
+    can cannot cant could couldnt did didnt do does doesnt doing done dont down during
+    each either else even ever every few for from further
+    gave get gets getting give given goes going gone got had hadnt has hasnt have havent having
+    he her here hers herself him himself his how however i if im in into is isnt it its itself ive
+    just least less let lets made make makes making many may me might mine more most much must my myself
+    neither never no nor not now of off often on once one only or other others our ours ourselves out over own
+    put said same saw say says see seen shall she should shouldnt since so some still such
+    than that thats the their theirs them themselves then there these they theyre this those though through
+    to too took under until up upon us very was wasnt we well went were werent what when where whether which
+    while who whom whose why will with within without wont would wouldnt yet you your youre yours yourself
+    asked called came felt kept knew left looked looks seemed seems told tried used wanted
+""".split())
+
+
+def _deletes(word, max_distance):
+    """All strings reachable from word by deleting up to max_distance characters (including word itself)."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions and
+    adjacent transpositions), or max_distance + 1 once it is known to be larger.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    def __init__(self, vocabulary, max_distance=2):
+        """
+        SymSpell-style deletion index over the single-word vocabulary entries.
+        Every vocabulary word is stored under each string obtained by deleting
+        up to max_distance characters, so a lookup only generates the deletes
+        of the query and checks the few words that share one.
+        vocabulary: word -> rank (lower ranks win ties, e.g. the class list index).
+        """
+        self.max_distance = max_distance
+        self.ranks = {}
+        self.deletes = {}
+        for word, rank in vocabulary.items():
+            if ' ' in word or not word.isalpha():
+                continue
+            self.ranks[word] = rank
+            for variant in _deletes(word, max_distance):
+                self.deletes.setdefault(variant, []).append(word)
+
+    def allowed_distance(self, word):
+        """
+        Short words get fewer edits, otherwise almost any short word would match.
+        Common English words get none (see COMMON_WORDS).
+        """
+        if len(word) <= 2 or word in COMMON_WORDS:
+            return 0
+        if len(word) <= 4:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, word):
+        """
+        Returns the closest vocabulary word within the allowed edit distance,
+        or None. Ties go to candidates that differ only by dropped or doubled
+        letters (the most common typos), then to the lowest rank.
+        """
+        max_distance = self.allowed_distance(word)
+        if max_distance == 0:
+            return None
+
+        candidates = set()
+        for variant in _deletes(word, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+
+        best = None
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                key = (distance, distance - abs(len(word) - len(candidate)), self.ranks[candidate])
+                if best is None or key < best[0]:
+                    best = (key, candidate)
+        return best[1] if best else None
@@ -0,0 +1,50 @@
+def tokenize(text):
+    """Lowercase, drop symbols and split into words (the same normalization for input text and class entries)"""
+    return ''.join(c for c in text.lower() if c.isalnum() or c.isspace()).split()
+
+
+class GlossTrie:
+    def __init__(self, vocabulary):
+        """
+        Token trie over the vocabulary entries, so multi-word entries
+        (e.g. "thank you") can match. Each node is a dict of
+        token -> child node; the None key holds the vocabulary entry
+        that ends at that node.
+        """
+        self.root = {}
+        self.max_depth = 0
+        for entry in vocabulary:
+            tokens = tokenize(entry)
+            if not tokens:
+                continue
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            # Keep the first entry when two normalize to the same tokens
+            node.setdefault(None, entry)
+            self.max_depth = max(self.max_depth, len(tokens))
+
+    def segment(self, tokens):
+        """
+        Splits tokens into longest vocabulary matches in one left-to-right pass.
+        Returns (start, end, entry) spans; entry is None for a single unmatched token.
+        Each step looks ahead at most max_depth tokens, so this is linear in len(tokens).
+        """
+        spans = []
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            match_end, match = None, None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if None in node:
+                    match_end, match = j, node[None]
+            if match is None:
+                spans.append((i, i + 1, None))
+                i += 1
+            else:
+                spans.append((i, match_end, match))
+                i = match_end
+        return spans
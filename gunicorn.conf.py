@@ -0,0 +1,37 @@
+# gunicorn app:app -c gunicorn.conf.py
+import gc
+import os
+
+bind = os.environ.get('WLASL_BIND', '127.0.0.1:5000')
+workers = int(os.environ.get('WLASL_WORKERS', '4'))
+
+# Load the app once in the master so workers share its pages copy-on-write
+preload_app = True
+# Tells app.py not to start warm-up threads at import: threads do not survive fork(),
+# and one holding a lock would deadlock the workers (when_ready and post_fork warm up instead)
+os.environ['WLASL_PRELOAD'] = '1'
+
+def when_ready(server):
+    """
+    Runs in the master after the app is imported and before workers fork.
+    gc.freeze moves every object to a permanent generation the collector
+    never scans, so collections in the workers do not write to (and unshare)
+    the pages holding the preloaded vocabulary and indexes.
+    """
+    # Load the data now, in the master (the speech pool is left to start in each worker after the fork)
+    import app
+    app.warm_up(['translator', 'content_hashes', 'stitcher'], background=False)
+    # Warming up may have opened the shared result cache; workers open their own connections
+    cache = app.get_translator().cache
+    if cache is not None:
+        cache.close()
+
+    gc.collect()
+    gc.freeze()
+    server.log.info("Froze %d objects before forking workers", gc.get_freeze_count())
+
+def post_fork(server, worker):
+    """With WLASL_WARM_UP=1, starts the speech recognizer in each worker once it has forked."""
+    if os.environ.get('WLASL_WARM_UP') == '1':
+        import app
+        app.warm_up(['speech'])
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Run in a fresh interpreter: time `import app`, then the first use of each subsystem
+SUBSYSTEM_TIMINGS = """
+import json, time
+started = time.perf_counter()
+import app
+import_seconds = time.perf_counter() - started
+timings = {}
+for name, subsystem in app.SUBSYSTEMS.items():
+    try:
+        subsystem.get()
+        timings[name] = subsystem.load_seconds
+    except Exception as e:
+        timings[name] = f"failed: {type(e).__name__}: {e}"
+print(json.dumps({"import_seconds": import_seconds, "first_use_seconds": timings}))
+"""
+
+
+def parse_importtime(stderr):
+    """Parses `python -X importtime` output into (module, self us, cumulative us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def profile(top=15):
+    """Profiles a cold `import app` and the first use of each lazily loaded subsystem."""
+    env = dict(os.environ)
+    env.pop('WLASL_WARM_UP', None)
+    env['WLASL_LOG_LEVEL'] = 'WARNING'
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1]}
+    rows = parse_importtime(result.stderr)
+    report = {
+        'modules': len(rows),
+        'total_import_ms': sum(self_us for _, self_us, _ in rows) / 1000.0,
+        'slowest_cumulative_ms': {module: cumulative / 1000.0 for module, _, cumulative in
+                                  sorted(rows, key=lambda row: row[2], reverse=True)[:top]},
+        'slowest_self_ms': {module: self_us / 1000.0 for module, self_us, _ in
+                            sorted(rows, key=lambda row: row[1], reverse=True)[:top]},
+    }
+
+    timings = subprocess.run([sys.executable, '-c', SUBSYSTEM_TIMINGS], cwd=ROOT, env=env, capture_output=True, text=True)
+    if timings.returncode == 0:
+        report.update(json.loads(timings.stdout.strip().splitlines()[-1]))
+    else:
+        report['first_use_error'] = timings.stderr.strip().splitlines()[-1]
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the cold-start cost of importing app.py")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    parser.add_argument("--output", help="also save the report as JSON, to compare between commits")
+    args = parser.parse_args()
+
+    report = profile(args.top)
+    if 'error' in report:
+        print(f"import app failed: {report['error']}")
+        sys.exit(1)
+
+    print(f"import app: {report['total_import_ms']:.1f}ms over {report['modules']} modules")
+    print("\nSlowest imports (cumulative ms):")
+    for module, ms in report['slowest_cumulative_ms'].items():
+        print(f"  {ms:9.1f}  {module}")
+    if 'first_use_seconds' in report:
+        print("\nFirst use of each subsystem:")
+        for name, seconds in report['first_use_seconds'].items():
+            print(f"  {name:15} {seconds:.2f}s" if isinstance(seconds, float) else f"  {name:15} {seconds}")
+    else:
+        print(f"\nSubsystem timings unavailable: {report['first_use_error']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"\nReport saved as {args.output}")
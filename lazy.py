@@ -0,0 +1,52 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Lazy:
+    def __init__(self, name, factory):
+        """
+        Builds a subsystem with factory() on first use. get() is thread safe:
+        concurrent first callers wait for a single build instead of racing.
+        A failed build is retried on the next get().
+        """
+        self.name = name
+        self.factory = factory
+        self.load_seconds = None
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                started = time.perf_counter()
+                self._value = self.factory()
+                self.load_seconds = time.perf_counter() - started
+                self._loaded = True
+                logger.info("Initialized %s in %.2fs", self.name, self.load_seconds)
+        return self._value
+
+    def load_in_background(self):
+        """Starts get() in a daemon thread; errors are logged and the next get() retries."""
+        def load():
+            try:
+                self.get()
+            except Exception:
+                logger.exception("Warming up %s failed", self.name)
+        thread = threading.Thread(target=load, name=f"warm-up-{self.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self):
+        if self._loaded:
+            return {'loaded': True, 'seconds': self.load_seconds}
+        return {'loaded': False, 'loading': self._lock.locked()}
@@ -1,105 +1,174 @@
-import json
-import os
-
-class WLASLRetrieval:
-    def __init__(self, json_path, video_dir, class_list_path):
-        """
-        Initializes the retrieval system.
-        """
-        self.video_dir = video_dir
-        
-        # Load the class list
-        self.word_to_index = {}
-        print("Loading class list...")  # Debug print
-        with open(class_list_path, 'r') as f:
-            for idx, line in enumerate(f):
-                # Remove number prefix, tabs, and whitespace
-                word = line.strip().lower()
-                # Remove any leading numbers and dots (e.g., "1.", "22.", etc.)
-                word = ' '.join(word.split()[1:]) if word.split()[0].rstrip('.').isdigit() else word
-                word = word.replace('\t', '')
-                self.word_to_index[word] = idx
-        print(f"Loaded {len(self.word_to_index)} words")  # Debug print
-        
-        # Load the JSON data
-        print("Loading JSON data...")  # Debug print
-        with open(json_path, "r") as f:
-            self.raw_data = json.load(f)
-        print(f"Loaded {len(self.raw_data)} entries")  # Debug print
-
-    def text_to_glosses(self, text):
-        """
-        Converts text input into WLASL glosses using the class list.
-        """
-        words = text.lower().split()
-        glosses = []
-        print(f"\nLooking for words: {words}")  # Debug print
-        for word in words:
-            print(f"Checking word: '{word}'")  # Debug print
-            if word in self.word_to_index:
-                index = self.word_to_index[word]
-                print(f"Found index {index} for word '{word}'")  # Debug print
-                if index < len(self.raw_data):
-                    gloss = self.raw_data[index]['gloss']
-                    print(f"Found gloss: {gloss}")  # Debug print
-                    glosses.append(gloss)
-            else:
-                print(f"Word '{word}' not found in class list")  # Debug print
-                # Print some available words for reference
-                print("Available words (first 10):", list(self.word_to_index.keys())[:10])
-        return glosses
-
-    def get_video_path(self, gloss):
-        """
-        Gets the video path for a given gloss.
-        """
-        # Special case for 'represent'
-        if gloss.lower() == 'represent':
-            return os.path.join(self.video_dir, '47387.mp4')
-
-        # Find the entry for this gloss
-        for entry in self.raw_data:
-            if entry['gloss'] == gloss:  # Exact match since we're using the class list
-                # Try each instance until we find a video that exists
-                for instance in entry['instances']:
-                    video_id = str(instance['video_id'])
-                    video_path = os.path.join(self.video_dir, f"{video_id}.mp4")
-                    if os.path.exists(video_path):
-                        return video_path
-        return None
-
-    def retrieve_videos(self, text):
-        """
-        Retrieves a sequence of videos based on input text.
-        """
-        glosses = self.text_to_glosses(text)
-        print(f"\nFound glosses: {glosses}")  # Debug print
-        video_paths = []
-
-        for gloss in glosses:
-            video_path = self.get_video_path(gloss)
-            if video_path and os.path.exists(video_path):
-                video_paths.append(video_path)
-            else:
-                print(f"Warning: No video found for '{gloss}'")
-
-        return video_paths
-
-if __name__ == "__main__":
-    json_path = r"wlasl_data/WLASL_v0.3.json"
-    video_dir = r"wlasl_data/new_refined_videos"
-    class_list_path = r"wlasl_data/wlasl_class_list.txt"
-
-    print("\nInitializing retriever...")  # Debug print
-    retriever = WLASLRetrieval(json_path, video_dir, class_list_path)
-
-    while True:
-        user_input = input("\nEnter text (or 'q' to quit): ")
-        if user_input.lower() == 'q':
-            break
-            
-        video_sequence = retriever.retrieve_videos(user_input)
-        if video_sequence:
-            print("Found videos:", video_sequence)
-        else:
-            print("No matching videos found.")
+import logging
+import os
+import sys
+from gloss_trie import GlossTrie, tokenize
+from snapshot import load_class_list, load_entries, load_snapshot
+from video_files import FileWatch
+from video_manifest import load_manifest
+
+logger = logging.getLogger(__name__)
+
+# How refresh() picks a clip when a gloss has several available instances
+SELECTION_POLICIES = {
+    'first': None,  # first instance in WLASL_v0.3.json order
+    'shortest': lambda info: (info['duration'] is None, info['duration'] or 0, info['size']),
+    'smallest': lambda info: info['size'],
+}
+
+class WLASLRetrieval:
+    def __init__(self, json_path, video_dir, class_list_path, snapshot_path=None, manifest_path=None, selection='first'):
+        """
+        Initializes the retrieval system.
+        If snapshot_path points to a fresh snapshot (see snapshot.py) it is
+        loaded instead of parsing the class list and the JSON.
+        If manifest_path points to a video manifest (see video_manifest.py) it is
+        used instead of listing video_dir, and selection picks among instances.
+        """
+        if selection not in SELECTION_POLICIES:
+            raise ValueError(f"Unknown selection policy: {selection}")
+        self.video_dir = video_dir
+        self.manifest_path = manifest_path
+        self.selection = selection
+        self.manifest = None
+
+        snapshot = load_snapshot(snapshot_path, json_path, video_dir, class_list_path) if snapshot_path else None
+        if snapshot:
+            logger.info("Loaded snapshot")
+            self.word_to_index = snapshot['word_to_index']
+            self.entries = snapshot['entries']
+            available = snapshot['available']
+        else:
+            # Load the class list
+            logger.info("Loading class list...")
+            self.word_to_index = load_class_list(class_list_path)
+
+            # Load the JSON data
+            logger.info("Loading JSON data...")
+            self.entries = load_entries(json_path)
+            available = None
+        logger.info("Loaded %d words and %d entries", len(self.word_to_index), len(self.entries))
+        self.trie = GlossTrie(self.word_to_index)
+
+        # Notices new clips or a rebuilt manifest, also when another process ran /refresh-videos
+        self.watch = FileWatch([video_dir, manifest_path])
+
+        # Build the gloss -> video path index once so lookups never scan
+        self.video_index = {}
+        self.refresh(available)
+        logger.info("Indexed %d glosses with videos", len(self.video_index))
+
+    def refresh(self, available=None):
+        """
+        Rebuilds the gloss-to-video index from the video manifest, or else
+        from a single listing of video_dir.
+        Call this after adding clips to video_dir (and re-running
+        video_manifest.py if one is used); no restart is needed.
+        """
+        manifest = load_manifest(self.manifest_path) if self.manifest_path else None
+        if manifest:
+            available = manifest['videos']
+        elif available is None:
+            try:
+                available = set(os.listdir(self.video_dir))
+            except FileNotFoundError:
+                available = set()
+
+        # Collect the available instances of each gloss in JSON order
+        candidates = {}
+        for gloss, video_ids in self.entries:
+            for video_id in video_ids:
+                filename = f"{video_id}.mp4"
+                if filename in available:
+                    candidates.setdefault(gloss.lower(), []).append(filename)
+
+        key = SELECTION_POLICIES[self.selection] if manifest else None
+        video_index = {}
+        for gloss, filenames in candidates.items():
+            filename = min(filenames, key=lambda name: key(available[name])) if key else filenames[0]
+            video_index[sys.intern(gloss)] = os.path.join(self.video_dir, filename)
+
+        # Special case for 'represent'
+        video_index['represent'] = os.path.join(self.video_dir, '47387.mp4')
+
+        # Swap in the new index in one assignment so readers never see a partial one
+        self.manifest = manifest
+        self.video_index = video_index
+        return len(video_index)
+
+    def refresh_if_changed(self):
+        """
+        Calls refresh() if video_dir or the manifest changed since the last
+        check. The check is a stat at most once per second, so it runs per request.
+        Returns True if the index was rebuilt.
+        """
+        if not self.watch.changed():
+            return False
+        self.refresh()
+        return True
+
+    def text_to_glosses(self, text):
+        """
+        Converts text input into WLASL glosses using the class list.
+        Multi-word class entries are matched by longest match.
+        """
+        words = tokenize(text)
+        glosses = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Looking for words: %s", words)
+        for start, end, entry in self.trie.segment(words):
+            if entry is not None:
+                index = self.word_to_index[entry]
+                if index < len(self.entries):
+                    gloss = self.entries[index][0]
+                    if debug:
+                        logger.debug("Found gloss %s (index %d) for '%s'", gloss, index, entry)
+                    glosses.append(gloss)
+            elif debug:
+                logger.debug("Word '%s' not found in class list", words[start])
+        return glosses
+
+    def get_video_path(self, gloss):
+        """
+        Gets the video path for a given gloss.
+        """
+        return self.video_index.get(gloss.lower())
+
+    def retrieve_videos(self, text):
+        """
+        Retrieves a sequence of videos based on input text.
+        """
+        glosses = self.text_to_glosses(text)
+        logger.debug("Found glosses: %s", glosses)
+        video_paths = []
+
+        for gloss in glosses:
+            video_path = self.get_video_path(gloss)
+            if video_path:
+                video_paths.append(video_path)
+            else:
+                logger.warning("No video found for '%s'", gloss)
+
+        return video_paths
+
+if __name__ == "__main__":
+    json_path = r"wlasl_data/WLASL_v0.3.json"
+    video_dir = r"wlasl_data/new_refined_videos"
+    class_list_path = r"wlasl_data/wlasl_class_list.txt"
+    snapshot_path = r"wlasl_data/wlasl_snapshot.sqlite"
+    manifest_path = r"wlasl_data/video_manifest.json"
+
+    logging.basicConfig(level=logging.DEBUG)
+    print("\nInitializing retriever...")
+    retriever = WLASLRetrieval(json_path, video_dir, class_list_path, snapshot_path, manifest_path)
+
+    while True:
+        user_input = input("\nEnter text (or 'q' to quit): ")
+        if user_input.lower() == 'q':
+            break
+            
+        video_sequence = retriever.retrieve_videos(user_input)
+        if video_sequence:
+            print("Found videos:", video_sequence)
+        else:
+            print("No matching videos found.")
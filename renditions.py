@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Bump this when the output layout or index fields change so every clip is rendered again
+RENDITIONS_VERSION = 1
+
+# Rendition name -> encoding. Heights are upper bounds; clips are never upscaled.
+RENDITIONS = {
+    'small': {'height': 240, 'crf': 32, 'maxrate': '250k'},
+    'medium': {'height': 480, 'crf': 28, 'maxrate': '800k'},
+}
+# Poster frames are JPEGs of the first frame, shown before a clip has been downloaded
+POSTER = {'height': 480, 'quality': 5}
+
+# Viewports up to this many CSS pixels wide get the rendition
+VIEWPORT_BREAKPOINTS = [(480, 'small'), (960, 'medium')]
+
+
+def rendition_path(rendition_dir, video_id, rendition):
+    return os.path.join(rendition_dir, rendition, video_id)
+
+
+def poster_path(rendition_dir, video_id):
+    return os.path.join(rendition_dir, 'posters', os.path.splitext(video_id)[0] + '.jpg')
+
+
+def settings_fingerprint():
+    """Short hash of the encoding settings; clips rendered with other settings are rendered again."""
+    settings = json.dumps({'renditions': RENDITIONS, 'poster': POSTER}, sort_keys=True)
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]
+
+
+def file_record(path):
+    """[mtime_ns, size, sha256] of an output, read by video_files.ContentHashes for ETags."""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+
+
+def output_records(rendition_dir, video_id, outputs):
+    """file_record of the poster and every rendition that was kept."""
+    records = {'poster': file_record(poster_path(rendition_dir, video_id))}
+    for name in RENDITIONS:
+        if outputs.get(name) is not None:
+            records[name] = file_record(rendition_path(rendition_dir, video_id, name))
+    return records
+
+
+def choose_rendition(quality=None, save_data=False, viewport_width=None):
+    """
+    Picks a rendition name from client hints, or None for the original clip.
+    An explicit quality ('small', 'medium' or 'original') wins, then Save-Data,
+    then the viewport width in CSS pixels.
+    """
+    if quality == 'original':
+        return None
+    if quality in RENDITIONS:
+        return quality
+    if save_data:
+        return 'small'
+    if viewport_width:
+        for max_width, rendition in VIEWPORT_BREAKPOINTS:
+            if viewport_width <= max_width:
+                return rendition
+    return None
+
+
+def render_clip(source, rendition_dir):
+    """
+    Writes every rendition and the poster of one clip with a single ffmpeg
+    run (the source is decoded once). A rendition that is not smaller than
+    the source is dropped, so the original is served instead.
+    Returns ({name: output size or None}, output_records). Runs in a worker process.
+    """
+    video_id = os.path.basename(source)
+    source_size = os.path.getsize(source)
+    outputs = {name: rendition_path(rendition_dir, video_id, name) for name in RENDITIONS}
+    outputs['poster'] = poster_path(rendition_dir, video_id)
+
+    # ffmpeg writes to temporary files that are swapped in, so a served file is never partial
+    tmp_paths = {}
+    for name, path in outputs.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stem, ext = os.path.splitext(path)
+        tmp_paths[name] = f"{stem}.tmp{ext}"
+
+    # One thread per process: the pool already runs one clip per core
+    command = ['ffmpeg', '-y', '-v', 'error', '-threads', '1', '-i', source]
+    for name, settings in RENDITIONS.items():
+        command += [
+            '-map', '0:v:0', '-an', '-vf', f"scale=-2:'min(ih,{settings['height']})'",
+            '-c:v', 'libx264', '-preset', 'slow', '-crf', str(settings['crf']),
+            '-maxrate', settings['maxrate'], '-bufsize', settings['maxrate'],
+            '-pix_fmt', 'yuv420p', '-movflags', '+faststart', tmp_paths[name]
+        ]
+    command += [
+        '-map', '0:v:0', '-vf', f"scale=-2:'min(ih,{POSTER['height']})'",
+        '-frames:v', '1', '-q:v', str(POSTER['quality']), tmp_paths['poster']
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "ffmpeg failed")
+
+        sizes = {}
+        for name, path in outputs.items():
+            size = os.path.getsize(tmp_paths[name])
+            if name != 'poster' and size >= source_size:
+                os.remove(tmp_paths[name])
+                if os.path.exists(path):
+                    os.remove(path)
+                sizes[name] = None
+            else:
+                os.replace(tmp_paths[name], path)
+                sizes[name] = size
+        return sizes, output_records(rendition_dir, video_id, sizes)
+    finally:
+        for tmp_path in tmp_paths.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def load_rendition_index(rendition_dir):
+    """
+    Loads the index written by build_renditions, or returns None if it is missing or from another version.
+    """
+    index_path = os.path.join(rendition_dir, 'index.json')
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r') as f:
+        index = json.load(f)
+    if index.get('version') != RENDITIONS_VERSION:
+        return None
+    return index
+
+
+def save_rendition_index(rendition_dir, videos):
+    index = {'version': RENDITIONS_VERSION, 'settings': settings_fingerprint(), 'videos': dict(sorted(videos.items()))}
+    # Write to a temporary file and swap it in so readers never see a partial index
+    index_path = os.path.join(rendition_dir, 'index.json')
+    with open(index_path + '.tmp', 'w') as f:
+        json.dump(index, f, indent=1)
+    os.replace(index_path + '.tmp', index_path)
+
+
+def _remove_outputs(rendition_dir, video_id):
+    for path in [rendition_path(rendition_dir, video_id, name) for name in RENDITIONS] + [poster_path(rendition_dir, video_id)]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def build_renditions(video_dir, rendition_dir, workers=None, save_every=200):
+    """
+    Renders every clip of video_dir into rendition_dir with a process pool.
+    Only clips that are new, changed (mtime or size), rendered with other
+    settings or missing an output are rendered again; outputs of deleted
+    clips are removed. The index records the size and sha256 of every
+    output, so the server never hashes them. Returns (rendered, failed) counts.
+    """
+    if shutil.which('ffmpeg') is None:
+        raise RuntimeError("ffmpeg is not installed")
+    os.makedirs(rendition_dir, exist_ok=True)
+
+    previous = load_rendition_index(rendition_dir)
+    settings_changed = previous is None or previous.get('settings') != settings_fingerprint()
+    previous_videos = previous['videos'] if previous else {}
+
+    videos = {}
+    to_render = []
+    with os.scandir(video_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith('.mp4'):
+                continue
+            stat = entry.stat()
+            old = previous_videos.get(entry.name)
+            up_to_date = (
+                old and not settings_changed
+                and old['mtime_ns'] == stat.st_mtime_ns and old['size'] == stat.st_size
+                and os.path.exists(poster_path(rendition_dir, entry.name))
+                and all(old['outputs'][name] is None or os.path.exists(rendition_path(rendition_dir, entry.name, name))
+                        for name in RENDITIONS)
+            )
+            if up_to_date:
+                if 'files' not in old:
+                    # Indexes written before the hashes were recorded
+                    old = dict(old, files=output_records(rendition_dir, entry.name, old['outputs']))
+                videos[entry.name] = old
+            else:
+                to_render.append((entry.name, stat))
+
+    for video_id in set(previous_videos) - set(videos) - {name for name, _ in to_render}:
+        _remove_outputs(rendition_dir, video_id)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_clip, os.path.join(video_dir, name), rendition_dir): (name, stat)
+                   for name, stat in to_render}
+        for done, future in enumerate(as_completed(futures), 1):
+            name, stat = futures[future]
+            try:
+                outputs, files = future.result()
+            except Exception as e:
+                # Not recorded, so the next run tries again
+                print(f"Failed to render {name}: {e}")
+                failed += 1
+                continue
+            videos[name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'outputs': outputs, 'files': files}
+            # Save progress now and then so an interrupted run resumes where it stopped
+            if done % save_every == 0:
+                save_rendition_index(rendition_dir, videos)
+
+    save_rendition_index(rendition_dir, videos)
+    return len(to_render) - failed, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render small and medium clips and poster frames with ffmpeg")
+    parser.add_argument("--video-dir", default=r"wlasl_data/new_refined_videos")
+    parser.add_argument("--output-dir", default=r"wlasl_data/renditions")
+    parser.add_argument("--workers", type=int, default=None, help="number of ffmpeg processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    rendered, failed = build_renditions(args.video_dir, args.output_dir, args.workers)
+    index = load_rendition_index(args.output_dir)
+    source_bytes = sum(video['size'] for video in index['videos'].values())
+    print(f"Rendered {rendered} clips ({failed} failed), {len(index['videos'])} up to date in {args.output_dir}")
+    for name in RENDITIONS:
+        rendition_bytes = sum(video['outputs'][name] or video['size'] for video in index['videos'].values())
+        print(f"  {name}: {rendition_bytes / 1e6:.1f}MB ({rendition_bytes / source_bytes:.0%} of the originals)" if source_bytes
+              else f"  {name}: no clips")
@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    def __init__(self, max_entries=4096, shared_path=None, max_shared_entries=100000):
+        """
+        Two-tier cache of translation results keyed by normalized text.
+        The first tier is an in-process LRU. The optional second tier is a
+        sqlite file that every worker process on the host can share.
+        Entries belong to a version (see set_version); entries of other
+        versions are never returned. The cache can be built before a fork:
+        each process opens its own sqlite connections.
+        """
+        self.max_entries = max_entries
+        self.shared_path = shared_path
+        self.max_shared_entries = max_shared_entries
+        self.version = None
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._local = threading.local()  # One sqlite connection per thread and process
+        self._inherited = []  # Connections opened by a parent process before fork()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._shared_puts = 0
+
+        if shared_path:
+            # Connections used for lookups are opened on first use, in the process that uses them
+            conn = sqlite3.connect(shared_path, timeout=5)
+            try:
+                with conn:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.execute('CREATE TABLE IF NOT EXISTS results (version TEXT, key TEXT, result TEXT, '
+                                 'PRIMARY KEY (version, key))')
+            finally:
+                conn.close()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid != os.getpid():
+            # SQLite connections must not be used across fork(). Closing it here could also
+            # disturb the parent's locks, so the child keeps a reference and never touches it.
+            self._inherited.append(conn)
+            conn = None
+        if conn is None:
+            conn = sqlite3.connect(self.shared_path, timeout=5)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def set_version(self, version):
+        """
+        Switches to a new vocabulary/video-set version and clears the local tier.
+        Shared rows of other versions are left alone, since workers that have not
+        switched yet still use them; the pruning in put() expires them.
+        """
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self._entries.clear()
+
+    def get(self, key):
+        """Returns a copy of the cached result for key, or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return dict(result)
+            version = self.version
+
+        if self.shared_path:
+            row = self._connection().execute(
+                'SELECT result FROM results WHERE version = ? AND key = ?', (version, key)
+            ).fetchone()
+            if row:
+                result = json.loads(row[0])
+                self._put_local(key, result)
+                with self._lock:
+                    self._shared_hits += 1
+                return dict(result)
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key, result):
+        """Stores a result in both tiers."""
+        self._put_local(key, result)
+        if self.shared_path:
+            with self._connection() as conn:
+                conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                             (self.version, key, json.dumps(result)))
+                with self._lock:
+                    self._shared_puts += 1
+                    prune = self._shared_puts % 1000 == 0
+                if prune:
+                    # Keep roughly the newest max_shared_entries rows
+                    conn.execute('DELETE FROM results WHERE rowid <= (SELECT MAX(rowid) FROM results) - ?',
+                                 (self.max_shared_entries,))
+
+    def close(self):
+        """Closes the calling thread's shared-tier connection; the next lookup opens a new one."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if self._local.pid == os.getpid():
+                conn.close()
+            else:
+                self._inherited.append(conn)
+        self._local.conn = None
+
+    def _put_local(self, key, result):
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters for both tiers."""
+        with self._lock:
+            lookups = self._hits + self._shared_hits + self._misses
+            return {
+                'version': self.version,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'shared': os.path.abspath(self.shared_path) if self.shared_path else None,
+                'hits': self._hits,
+                'shared_hits': self._shared_hits,
+                'misses': self._misses,
+                'hit_rate': (self._hits + self._shared_hits) / lookups if lookups else 0.0,
+            }
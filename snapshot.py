@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from array import array
+
+# Bump this whenever the table layout changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+
+def load_class_list(class_list_path):
+    """
+    Parses wlasl_class_list.txt into a word -> index dictionary.
+    """
+    word_to_index = {}
+    with open(class_list_path, 'r') as f:
+        for idx, line in enumerate(f):
+            # Remove number prefix, tabs, and whitespace
+            word = line.strip().lower()
+            # Remove any leading numbers and dots (e.g., "1.", "22.", etc.)
+            word = ' '.join(word.split()[1:]) if word.split()[0].rstrip('.').isdigit() else word
+            word = word.replace('\t', '')
+            word_to_index[sys.intern(word)] = idx
+    return word_to_index
+
+
+class EntryTable:
+    """
+    Compact, read-only sequence of (gloss, [video_id, ...]) entries.
+    Glosses are interned strings; all video ids live in one string with
+    array-backed offsets, so there is no Python object per instance.
+    Few objects means little to copy after fork (see gunicorn.conf.py).
+    """
+    __slots__ = ('glosses', '_first_id', '_id_ends', '_ids')
+
+    def __init__(self, entries):
+        self.glosses = []
+        self._first_id = array('I', [0])  # entry i owns ids _first_id[i]:_first_id[i + 1]
+        self._id_ends = array('I')  # id j is _ids[_id_ends[j - 1]:_id_ends[j]]
+        parts = []
+        length = 0
+        for gloss, video_ids in entries:
+            self.glosses.append(sys.intern(gloss))
+            for video_id in video_ids:
+                parts.append(video_id)
+                length += len(video_id)
+                self._id_ends.append(length)
+            self._first_id.append(len(self._id_ends))
+        self._ids = ''.join(parts)
+
+    def __len__(self):
+        return len(self.glosses)
+
+    def video_ids(self, index):
+        first, last = self._first_id[index], self._first_id[index + 1]
+        ends = self._id_ends
+        return [self._ids[(ends[j - 1] if j else 0):ends[j]] for j in range(first, last)]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.glosses)
+        if not 0 <= index < len(self.glosses):
+            raise IndexError("entry index out of range")
+        return self.glosses[index], self.video_ids(index)
+
+    def __iter__(self):
+        for index, gloss in enumerate(self.glosses):
+            yield gloss, self.video_ids(index)
+
+
+def load_entries(json_path):
+    """
+    Loads WLASL_v0.3.json keeping only what serving needs:
+    an EntryTable of (gloss, [video_id, ...]) in file order.
+    """
+    with open(json_path, "r") as f:
+        raw_data = json.load(f)
+    return EntryTable(
+        (entry['gloss'], [str(instance['video_id']) for instance in entry['instances']])
+        for entry in raw_data
+    )
+
+
+def file_signature(path):
+    """
+    Returns (mtime_ns, size, sha256) for a source file.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+
+
+def _is_fresh(path, signature):
+    """
+    Checks a source file against its recorded signature.
+    mtime and size are checked first; the hash only when they differ.
+    """
+    if not os.path.exists(path):
+        # Deployments may ship only the snapshot, so trust it
+        return True
+    stat = os.stat(path)
+    if [stat.st_mtime_ns, stat.st_size] == signature[:2]:
+        return True
+    return file_signature(path)[2] == signature[2]
+
+
+def build_snapshot(json_path, video_dir, class_list_path, snapshot_path):
+    """
+    Compiles the class list, the gloss -> video ids mapping and the set of
+    available video files into one sqlite file.
+    """
+    word_to_index = load_class_list(class_list_path)
+    entries = load_entries(json_path)
+    try:
+        available = sorted(os.listdir(video_dir))
+        video_dir_mtime = os.stat(video_dir).st_mtime_ns
+    except FileNotFoundError:
+        available = []
+        video_dir_mtime = 0
+
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'json': file_signature(json_path),
+        'class_list': file_signature(class_list_path),
+        'video_dir_mtime': video_dir_mtime,
+    }
+
+    # Write to a temporary file and swap it in so readers never see a partial snapshot
+    tmp_path = snapshot_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE classes (word TEXT PRIMARY KEY, idx INTEGER);
+            CREATE TABLE entries (idx INTEGER PRIMARY KEY, gloss TEXT, video_ids TEXT);
+            CREATE TABLE videos (filename TEXT PRIMARY KEY);
+        """)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         [(key, json.dumps(value)) for key, value in meta.items()])
+        conn.executemany("INSERT INTO classes VALUES (?, ?)", word_to_index.items())
+        conn.executemany("INSERT INTO entries VALUES (?, ?, ?)",
+                         [(idx, gloss, ','.join(video_ids))
+                          for idx, (gloss, video_ids) in enumerate(entries)])
+        conn.executemany("INSERT INTO videos VALUES (?)", [(name,) for name in available])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, snapshot_path)
+    return meta
+
+
+def load_snapshot(snapshot_path, json_path, video_dir, class_list_path):
+    """
+    Loads a snapshot built by build_snapshot.
+    Returns None if it is missing, from another version, or older than its sources.
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+
+    conn = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    try:
+        meta = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        if meta.get('version') != SNAPSHOT_VERSION:
+            return None
+        if not (_is_fresh(json_path, meta['json']) and _is_fresh(class_list_path, meta['class_list'])):
+            return None
+
+        word_to_index = {sys.intern(word): idx for word, idx in conn.execute("SELECT word, idx FROM classes ORDER BY idx")}
+        entries = EntryTable(
+            (gloss, video_ids.split(',') if video_ids else [])
+            for gloss, video_ids in conn.execute("SELECT gloss, video_ids FROM entries ORDER BY idx")
+        )
+
+        # The file listing is only reused while the directory is unchanged
+        available = None
+        try:
+            if os.stat(video_dir).st_mtime_ns == meta['video_dir_mtime']:
+                available = {name for (name,) in conn.execute("SELECT filename FROM videos")}
+        except FileNotFoundError:
+            pass
+    except sqlite3.DatabaseError:
+        return None
+    finally:
+        conn.close()
+
+    return {
+        'word_to_index': word_to_index,
+        'entries': entries,
+        'available': available,
+    }
+
+
+if __name__ == "__main__":
+    json_path = r"wlasl_data/WLASL_v0.3.json"
+    video_dir = r"wlasl_data/new_refined_videos"
+    class_list_path = r"wlasl_data/wlasl_class_list.txt"
+    snapshot_path = r"wlasl_data/wlasl_snapshot.sqlite"
+
+    print("Building snapshot...")
+    build_snapshot(json_path, video_dir, class_list_path, snapshot_path)
+    print(f"Snapshot saved as {snapshot_path}")
@@ -0,0 +1,114 @@
+import io
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import speech_recognition as sr
+
+
+class RecognizerBusy(Exception):
+    """Raised when a request cannot be queued, or waited in the queue for too long."""
+
+
+class GoogleRecognizer:
+    def __init__(self):
+        """Sends the audio to the Google Web Speech API (needs network access)."""
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio_data):
+        return self.recognizer.recognize_google(audio_data)
+
+
+class VoskRecognizer:
+    def __init__(self, model_path, sample_rate=16000):
+        """
+        Offline recognition with a Vosk model directory (pip install vosk and
+        download a model from https://alphacephei.com/vosk/models).
+        The model is loaded once and reused for every request.
+        """
+        from vosk import Model, SetLogLevel # type: ignore
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+        self.sample_rate = sample_rate
+
+    def recognize(self, audio_data):
+        from vosk import KaldiRecognizer # type: ignore
+        recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+# Backend name -> (recognizer class, True if it runs in worker processes)
+BACKENDS = {
+    'google': (GoogleRecognizer, False),  # Waits on the network, so threads are enough
+    'vosk': (VoskRecognizer, True),  # CPU bound, so it gets its own processes
+}
+
+# The recognizer of the current worker (thread pool: shared; process pool: one per process)
+_engine = None
+
+
+def _init_engine(backend, options):
+    global _engine
+    _engine = BACKENDS[backend][0](**options)
+
+
+def _recognize(audio_bytes, submitted, max_wait):
+    """Runs in a worker: decodes the audio and recognizes it. Returns (text, queue seconds, recognize seconds)."""
+    started = time.time()
+    if max_wait is not None and started - submitted > max_wait:
+        raise RecognizerBusy(f"Request waited more than {max_wait}s in the queue")
+    with sr.AudioFile(io.BytesIO(audio_bytes)) as source:
+        audio_data = sr.Recognizer().record(source)
+    text = _engine.recognize(audio_data)
+    return text, started - submitted, time.time() - started
+
+
+class SpeechService:
+    def __init__(self, backend='google', workers=2, max_queue=4, max_wait=10.0, **options):
+        """
+        Runs speech recognition off the request thread in a bounded pool.
+        At most workers + max_queue requests are accepted at a time; further
+        requests fail fast with RecognizerBusy instead of blocking a web worker,
+        and so do queued requests that waited longer than max_wait seconds.
+        options are passed to the recognizer class (e.g. model_path for vosk).
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown speech backend: {backend}")
+        self.backend = backend
+        self.max_wait = max_wait
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+        if BACKENDS[backend][1]:
+            self.pool = ProcessPoolExecutor(workers, initializer=_init_engine, initargs=(backend, options))
+        else:
+            _init_engine(backend, options)
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix='speech')
+
+    def submit(self, audio_bytes):
+        """
+        Queues WAV/AIFF/FLAC bytes for transcription and returns a Future of
+        (text, queue seconds, recognize seconds). Raises RecognizerBusy when full.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RecognizerBusy("Too many speech requests in progress")
+        try:
+            future = self.pool.submit(_recognize, audio_bytes, time.time(), self.max_wait)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def recognize(self, audio_bytes, timeout=None):
+        """
+        Transcribes WAV/AIFF/FLAC bytes. Returns (text, queue seconds, recognize seconds).
+        Raises RecognizerBusy, sr.UnknownValueError or sr.RequestError.
+        """
+        return self.submit(audio_bytes).result(timeout)
+
+    def close(self):
+        self.pool.shutdown()
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+class StitchError(Exception):
+    """Raised when ffmpeg is unavailable or fails to join the clips."""
+
+class SentenceStitcher:
+    def __init__(self, video_dir, cache_dir, max_cache_bytes=512 * 1024 * 1024, signatures=None):
+        """
+        Joins per-word clips into one MP4 per sentence and keeps the results
+        in a size-bounded, least-recently-used cache directory.
+        signatures(path) returns the content hash recorded for a clip (e.g.
+        ContentHashes.recorded), or None to fall back to its mtime and size.
+        """
+        self.video_dir = video_dir
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.signatures = signatures
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._probe_cache = {}  # path -> (mtime_ns, stream signature)
+        self._locks = {}  # cache key -> lock, so a sentence is only built once at a time
+        self._locks_lock = threading.Lock()
+
+    def cache_key(self, video_ids):
+        """
+        Cache key for an ordered list of video ids. Each clip's recorded hash
+        (or else its mtime and size) is part of the key, so replacing a clip
+        builds the sentence again. Clips with a recorded hash are not stat'ed.
+        Raises FileNotFoundError for a missing clip without a recorded hash.
+        """
+        parts = []
+        for video_id in video_ids:
+            path = os.path.join(self.video_dir, video_id)
+            signature = self.signatures(path) if self.signatures else None
+            if signature is None:
+                stat = os.stat(path)
+                signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+            parts.append(f"{video_id}:{signature}")
+        return hashlib.sha1(','.join(parts).encode('utf-8')).hexdigest()
+
+    def stitch(self, video_ids):
+        """
+        Returns the path of one MP4 playing video_ids in order, building it on a cache miss.
+        """
+        key = self.cache_key(video_ids)
+        output_path = os.path.join(self.cache_dir, f"{key}.mp4")
+        if self._touch(output_path):
+            return output_path
+
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                # Another request may have built it while we waited
+                if self._touch(output_path):
+                    return output_path
+                self._build(video_ids, output_path)
+        finally:
+            with self._locks_lock:
+                self._locks.pop(key, None)
+
+        self._evict(keep=output_path)
+        return output_path
+
+    def _build(self, video_ids, output_path):
+        """Joins the clips for video_ids into output_path."""
+        paths = [os.path.join(self.video_dir, video_id) for video_id in video_ids]
+        for path in paths:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(os.path.basename(path))
+
+        fd, tmp_path = tempfile.mkstemp(suffix='.mp4', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            # Stream-copy when every clip has the same video encoding, re-encode otherwise
+            signatures = {self._probe(path) for path in paths}
+            if len(signatures) == 1:
+                self._concat_copy(paths, tmp_path)
+            else:
+                self._concat_encode(paths, tmp_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _touch(self, path):
+        """Marks a cached file as recently used; returns False if it is not cached."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _evict(self, keep=None):
+        """
+        Removes least recently used files until the cache fits in max_cache_bytes.
+        keep (the file about to be returned) is never removed.
+        """
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.mp4') and entry.path != keep:
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files) + (os.path.getsize(keep) if keep else 0)
+        for _, size, path in sorted(files):
+            if total <= self.max_cache_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def _run(self, command):
+        """Runs an ffmpeg/ffprobe command and returns its stdout."""
+        if shutil.which(command[0]) is None:
+            raise StitchError(f"{command[0]} is not installed")
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise StitchError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"{command[0]} failed")
+        return result.stdout
+
+    def _probe(self, path):
+        """Returns the parameters that must match for clips to be stream-copied together."""
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._probe_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        output = self._run([
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=codec_name,profile,width,height,pix_fmt,time_base',
+            '-of', 'json', path
+        ])
+        streams = json.loads(output).get('streams') or [{}]
+        stream = streams[0]
+        signature = tuple(stream.get(field) for field in ('codec_name', 'profile', 'width', 'height', 'pix_fmt', 'time_base'))
+        self._probe_cache[path] = (mtime, signature)
+        return signature
+
+    def _concat_copy(self, paths, output_path):
+        """Joins clips with the concat demuxer without re-encoding."""
+        fd, list_path = tempfile.mkstemp(suffix='.txt', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for path in paths:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            self._run([
+                'ffmpeg', '-y', '-v', 'error', '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-map', '0:v', '-c', 'copy', '-movflags', '+faststart', output_path
+            ])
+        finally:
+            os.remove(list_path)
+
+    def _concat_encode(self, paths, output_path):
+        """Joins clips with different encodings, scaling them to the first clip's size."""
+        _, _, width, height, _, _ = self._probe(paths[0])
+        command = ['ffmpeg', '-y', '-v', 'error']
+        for path in paths:
+            command += ['-i', path]
+        filters = [
+            f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps=25,format=yuv420p[v{i}]"
+            for i in range(len(paths))
+        ]
+        inputs = ''.join(f"[v{i}]" for i in range(len(paths)))
+        filters.append(f"{inputs}concat=n={len(paths)}:v=1:a=0[out]")
+        command += [
+            '-filter_complex', ';'.join(filters), '-map', '[out]',
+            '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23', '-movflags', '+faststart', output_path
+        ]
+        self._run(command)
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+
+# Bump this whenever the index format or the ranking rules change
+SYNONYM_INDEX_VERSION = 1
+
+# Words mapped by hand instead of through WordNet; '' means the word is dropped
+SPECIAL_CASES = {
+    'am': 'represent',
+    'hi': 'hello',
+    'is': '',
+    'the': '',
+    'and': '',
+}
+
+# Vocabulary words that are never offered as a synonym
+EXCLUDED_SYNONYMS = {'cost'}
+
+
+def vocabulary_hash(vocabulary):
+    """
+    Fingerprint of a vocabulary, used to detect a stale synonym index.
+    """
+    return hashlib.sha256('\n'.join(sorted(vocabulary)).encode('utf-8')).hexdigest()
+
+
+def get_synonyms(word):
+    """
+    Get all WordNet synonyms for a word, most common sense first.
+    """
+    from nltk.corpus import wordnet
+
+    synonyms = []
+    seen = set()
+    for syn in wordnet.synsets(word):
+        for lemma in syn.lemmas():
+            synonym = lemma.name().lower()
+            if synonym not in seen:
+                seen.add(synonym)
+                synonyms.append(synonym)
+    return synonyms
+
+
+def best_synonym(word, vocabulary):
+    """
+    Returns the vocabulary word a non-vocabulary word maps to, '' if the word
+    should be dropped, or None if there is no match.
+    Candidates are ranked by WordNet sense order, then lemma order.
+    """
+    word = word.lower()
+    if word in SPECIAL_CASES:
+        return SPECIAL_CASES[word]
+    for synonym in get_synonyms(word):
+        if synonym in vocabulary and synonym not in EXCLUDED_SYNONYMS:
+            return synonym
+    return None
+
+
+def _inflections(lemma):
+    """
+    Regular English inflections of a lemma, so that forms like 'apples' or
+    'walking' that WordNet resolves through morphy are also indexed.
+    """
+    forms = {lemma + 's', lemma + 'es', lemma + 'ed', lemma + 'd', lemma + 'ing', lemma + 'er', lemma + 'est'}
+    if lemma.endswith('e'):
+        forms.add(lemma[:-1] + 'ing')
+    if lemma.endswith('y'):
+        forms.update({lemma[:-1] + 'ies', lemma[:-1] + 'ied'})
+    if len(lemma) > 2 and lemma[-1] not in 'aeiouwxy' and lemma[-2] in 'aeiou':
+        forms.update({lemma + lemma[-1] + 'ed', lemma + lemma[-1] + 'ing'})
+    return forms
+
+
+def build_synonym_index(vocabulary):
+    """
+    Inverts WordNet into a map from any lemma (and its regular or irregular
+    inflections) to the best vocabulary word. Vocabulary words themselves are
+    not stored since they always match exactly.
+    """
+    from nltk.corpus import wordnet
+
+    vocabulary = set(vocabulary)
+    candidates = set()
+    for lemma in wordnet.all_lemma_names():
+        # User input never contains underscores, so multi-word lemmas cannot be looked up
+        if '_' in lemma:
+            continue
+        candidates.add(lemma)
+        for form in _inflections(lemma):
+            if wordnet.morphy(form) is not None:
+                candidates.add(form)
+    for exceptions in getattr(wordnet, '_exception_map', {}).values():
+        candidates.update(form for form in exceptions if '_' not in form)
+
+    index = {}
+    for word in sorted(candidates - vocabulary):
+        match = best_synonym(word, vocabulary)
+        if match is not None:
+            index[word] = match
+    for word, match in SPECIAL_CASES.items():
+        if word not in vocabulary:
+            index[word] = match
+    return index
+
+
+def save_synonym_index(index, vocabulary, index_path):
+    """
+    Writes the synonym index as compact JSON.
+    """
+    with open(index_path, 'w') as f:
+        json.dump({
+            'version': SYNONYM_INDEX_VERSION,
+            'vocabulary': vocabulary_hash(vocabulary),
+            'synonyms': index,
+        }, f, separators=(',', ':'), sort_keys=True)
+
+
+def load_synonym_index(index_path, vocabulary):
+    """
+    Loads a synonym index built for this vocabulary.
+    Returns None if it is missing, from another version, or built for another vocabulary.
+    """
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != SYNONYM_INDEX_VERSION or data.get('vocabulary') != vocabulary_hash(vocabulary):
+        return None
+    return data['synonyms']
+
+
+if __name__ == "__main__":
+    from snapshot import load_class_list
+
+    class_list_path = r"wlasl_data/wlasl_class_list.txt"
+    index_path = r"wlasl_data/synonym_index.json"
+
+    vocabulary = set(load_class_list(class_list_path))
+    print(f"Inverting WordNet for {len(vocabulary)} words...")
+    index = build_synonym_index(vocabulary)
+    save_synonym_index(index, vocabulary, index_path)
+    print(f"Saved {len(index)} synonyms as {index_path}")
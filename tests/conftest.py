@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app modules live at the repository root and the model scripts in V2/; neither is a package.
+# The root comes first, so `import predict` is the app's retriever (V2's is loaded by path where needed).
+sys.path[:0] = [ROOT, os.path.join(ROOT, "V2")]
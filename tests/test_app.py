@@ -0,0 +1,79 @@
+import json
+import os
+import pytest
+
+pytest.importorskip("flask")
+import app as flask_app  # noqa: E402
+from lazy import Lazy  # noqa: E402
+from predict import WLASLRetrieval  # noqa: E402
+from translator import Translator  # noqa: E402
+from video_files import ContentHashes  # noqa: E402
+
+WLASL = [
+    {"gloss": "hello", "instances": [{"video_id": "00001"}]},
+    {"gloss": "thank you", "instances": [{"video_id": "00002"}]},
+    {"gloss": "mother", "instances": [{"video_id": "00003"}]},
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "WLASL_v0.3.json").write_text(json.dumps(WLASL))
+    (tmp_path / "wlasl_class_list.txt").write_text("0\thello\n1\tthank you\n2\tmother\n")
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    for video_id in ["00001", "00002", "00003"]:
+        (video_dir / f"{video_id}.mp4").write_bytes(video_id.encode())
+
+    def load_translator():
+        retriever = WLASLRetrieval(str(tmp_path / "WLASL_v0.3.json"), str(video_dir), str(tmp_path / "wlasl_class_list.txt"))
+        return Translator(retriever, synonym_index={})
+
+    monkeypatch.setattr(flask_app, "video_dir", str(video_dir))
+    monkeypatch.setattr(flask_app, "rendition_dir", str(tmp_path / "renditions"))
+    monkeypatch.setattr(flask_app, "_playlist_cache", (None, None, {}))
+    monkeypatch.setitem(flask_app.SUBSYSTEMS, "translator", Lazy("translator", load_translator))
+    monkeypatch.setitem(flask_app.SUBSYSTEMS, "content_hashes", Lazy("content_hashes", ContentHashes))
+    return flask_app.app.test_client()
+
+
+def test_translate_returns_a_playlist(client):
+    result = client.post("/translate", json={"text": "Hello mother"}).get_json()
+    assert result["videos"] == ["00001.mp4", "00003.mp4"]
+    assert [entry["video"] for entry in result["playlist"]] == result["videos"]
+    entry = result["playlist"][0]
+    assert entry["url"].startswith("/videos/00001.mp4?q=original&v=")
+    assert entry["poster"] is None
+    assert entry["size"] == 5
+
+    batch = client.post("/translate/batch", json={"texts": ["hello"]}).get_json()
+    assert batch["results"][0]["playlist"][0]["url"] == entry["url"]
+
+
+def test_repeated_playlists_touch_no_file(client, monkeypatch):
+    first = client.post("/translate", json={"text": "hello mother"}).get_json()
+    # Only the once-a-second change checks may stat, and not during this test
+    flask_app.get_retriever().watch.interval = 3600
+    flask_app.get_content_hashes().watch.interval = 3600
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError("playlist touched the disk")
+    monkeypatch.setattr(os, "stat", no_disk)
+    monkeypatch.setattr(os.path, "exists", no_disk)
+    second = client.post("/translate", json={"text": "hello mother"}).get_json()
+    assert second["playlist"] == first["playlist"]
+
+
+def test_playlist_entries_are_rebuilt_after_a_refresh(client):
+    first = client.post("/translate", json={"text": "hello"}).get_json()["playlist"][0]
+    with open(os.path.join(flask_app.video_dir, "00001.mp4"), "wb") as f:
+        f.write(b"a longer clip")
+    assert client.post("/refresh-videos").status_code == 200
+    second = client.post("/translate", json={"text": "hello"}).get_json()["playlist"][0]
+    assert second["size"] == len(b"a longer clip")
+    assert second["url"] != first["url"]
+
+
+def test_playlist_entries_carry_their_words(client):
+    result = client.post("/translate", json={"text": "Thank you, xyzzy mother"}).get_json()
+    assert [(entry["word"], entry["gloss"]) for entry in result["playlist"]] == [("thank you", "thank you"), ("mother", "mother")]
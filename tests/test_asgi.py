@@ -0,0 +1,134 @@
+import asyncio
+import email.utils
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+import asgi  # noqa: E402
+from lazy import Lazy  # noqa: E402
+from starlette.testclient import TestClient  # noqa: E402
+from video_files import ContentHashes  # noqa: E402
+
+CLIP = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    (video_dir / "00001.mp4").write_bytes(CLIP)
+    monkeypatch.setattr(asgi.flask_app, "video_dir", str(video_dir))
+    monkeypatch.setattr(asgi.flask_app, "rendition_dir", str(tmp_path / "renditions"))
+    monkeypatch.setitem(asgi.flask_app.SUBSYSTEMS, "content_hashes", Lazy("content_hashes", ContentHashes))
+    with TestClient(asgi.app) as client:
+        yield client
+
+
+def test_full_response_and_cache_headers(client):
+    response = client.get("/videos/00001.mp4")
+    assert response.status_code == 200
+    assert response.content == CLIP
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["cache-control"] == "no-cache"
+    assert "Save-Data" in response.headers["vary"]
+
+    etag = response.headers["etag"].strip('"')
+    immutable = client.get(f"/videos/00001.mp4?q=original&v={etag}")
+    assert "immutable" in immutable.headers["cache-control"]
+    assert "vary" not in immutable.headers
+
+
+def test_missing_video(client):
+    assert client.get("/videos/00002.mp4").status_code == 404
+
+
+def test_if_none_match(client):
+    etag = client.get("/videos/00001.mp4").headers["etag"]
+    assert client.get("/videos/00001.mp4", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/videos/00001.mp4", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get("/videos/00001.mp4", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_if_modified_since(client):
+    last_modified = client.get("/videos/00001.mp4").headers["last-modified"]
+    assert client.get("/videos/00001.mp4", headers={"If-Modified-Since": last_modified}).status_code == 304
+    earlier = email.utils.formatdate(0, usegmt=True)
+    assert client.get("/videos/00001.mp4", headers={"If-Modified-Since": earlier}).status_code == 200
+
+
+def test_malformed_if_modified_since_is_ignored(client):
+    for value in ["not a date", "Mon, 99 Foo 2024 25:61:61 GMT"]:
+        response = client.get("/videos/00001.mp4", headers={"If-Modified-Since": value})
+        assert response.status_code == 200
+        assert response.content == CLIP
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=10-19", 10, 19),
+    ("bytes=10-", 10, len(CLIP) - 1),
+    ("bytes=-5", len(CLIP) - 5, len(CLIP) - 1),
+    ("bytes=0-999999", 0, len(CLIP) - 1),
+])
+def test_range(client, header, start, end):
+    response = client.get("/videos/00001.mp4", headers={"Range": header})
+    assert response.status_code == 206
+    assert response.content == CLIP[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CLIP)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+@pytest.mark.parametrize("header", ["bytes=999999-", "bytes=20-10", "bytes=-0", "bytes=abc-"])
+def test_unsatisfiable_range(client, header):
+    response = client.get("/videos/00001.mp4", headers={"Range": header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CLIP)}"
+
+
+def test_range_with_stale_if_range_gets_the_whole_clip(client):
+    etag = client.get("/videos/00001.mp4").headers["etag"]
+    current = client.get("/videos/00001.mp4", headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert current.status_code == 206
+    stale = client.get("/videos/00001.mp4", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+    assert stale.status_code == 200
+    assert stale.content == CLIP
+
+
+def test_rendition_falls_back_to_the_original(client, tmp_path):
+    assert client.get("/videos/00001.mp4?q=small").content == CLIP
+    small = tmp_path / "renditions" / "small"
+    small.mkdir(parents=True)
+    (small / "00001.mp4").write_bytes(b"small")
+    assert client.get("/videos/00001.mp4?q=small").content == b"small"
+    assert client.get("/videos/00001.mp4", headers={"Save-Data": "on"}).content == b"small"
+
+
+def test_acquire_permit_times_out_without_leaking():
+    async def scenario():
+        semaphore = asyncio.Semaphore(1)
+        assert await asgi.acquire_permit(semaphore, 1)
+        assert not await asgi.acquire_permit(semaphore, 0.01)
+        semaphore.release()
+        await asyncio.sleep(0)
+        assert await asgi.acquire_permit(semaphore, 0.01)
+        semaphore.release()
+        assert not semaphore.locked()
+
+    asyncio.run(scenario())
+
+
+def test_acquire_permit_returns_a_permit_granted_while_cancelled():
+    async def scenario():
+        semaphore = asyncio.Semaphore(1)
+        await semaphore.acquire()
+        waiter = asyncio.ensure_future(asgi.acquire_permit(semaphore, 5))
+        await asyncio.sleep(0)
+        # The permit is handed to the waiting acquire, then the request is cancelled before it resumes
+        semaphore.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        assert not semaphore.locked()
+
+    asyncio.run(scenario())
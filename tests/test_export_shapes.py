@@ -0,0 +1,48 @@
+import importlib.util
+import os
+import pytest
+from conftest import ROOT
+from export_tflite import sample_shape
+
+
+def load_v2_predict():
+    """V2/predict.py shares its module name with the root predict.py, so load it by path."""
+    spec = importlib.util.spec_from_file_location("v2_predict", os.path.join(ROOT, "V2", "predict.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_sample_shape_fills_dynamic_dimensions():
+    assert sample_shape((None, None)) == (1, 20)
+    assert sample_shape((None, None), 7) == (1, 7)
+    assert sample_shape((None, 1)) == (1, 1)
+    assert sample_shape((None, 512), 7) == (1, 512)
+
+
+def test_tflite_export_of_dynamic_length_models(tmp_path):
+    tf = pytest.importorskip("tensorflow")
+    np = pytest.importorskip("numpy")
+    from export_tflite import export_tflite
+    from train_text_to_gloss import build_inference_models, build_seq2seq_model
+
+    model = build_seq2seq_model(50, embedding_dim=8, hidden_units=8, max_length=None, dropout_rate=0.0)
+    encoder, decoder = build_inference_models(model)
+    encoder_path = export_tflite(encoder, str(tmp_path / "encoder.tflite"), sample_length=20)
+    decoder_path = export_tflite(decoder, str(tmp_path / "decoder.tflite"), sample_length=20)
+
+    v2_predict = load_v2_predict()
+    tflite_encoder = v2_predict.TFLiteModel(encoder_path)
+    tflite_decoder = v2_predict.TFLiteModel(decoder_path)
+
+    tokens = np.array([[3, 4, 5] + [0] * 17, [6] * 20], dtype=np.int32)
+    state_h, state_c = tflite_encoder(tokens)
+    assert state_h.shape == (2, 16)
+    np.testing.assert_allclose(state_h, np.asarray(encoder(tokens)[0]), atol=1e-2)
+
+    # Another batch size and sequence length reuses the same interpreter
+    short_h, _ = tflite_encoder(tokens[:1, :3])
+    np.testing.assert_allclose(short_h[0], state_h[0], atol=1e-2)
+
+    probs, _, _ = tflite_decoder([np.array([[1], [2]]), state_h, state_c])
+    assert probs.shape == (2, 1, 50)
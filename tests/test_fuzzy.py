@@ -0,0 +1,77 @@
+import os
+import pytest
+from fuzzy import COMMON_WORDS, FuzzyIndex, _deletes, edit_distance
+from snapshot import load_class_list
+
+CLASS_LIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wlasl_data", "wlasl_class_list.txt")
+
+VOCABULARY = {word: rank for rank, word in enumerate(
+    ["hello", "help", "happy", "water", "walk", "want", "school", "no", "thank you", "cool", "call"])}
+
+
+def test_deletes():
+    assert _deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+    assert _deletes("ab", 2) == {"ab", "a", "b", ""}
+
+
+def test_edit_distance():
+    assert edit_distance("hello", "hello", 2) == 0
+    assert edit_distance("helo", "hello", 2) == 1
+    assert edit_distance("hlelo", "hello", 2) == 1  # adjacent transposition
+    assert edit_distance("wtaer", "water", 2) == 1
+    assert edit_distance("hxllx", "hello", 2) == 2
+    assert edit_distance("abcdef", "hello", 2) == 3
+    assert edit_distance("h", "hello", 2) == 3
+
+
+def test_corrections():
+    index = FuzzyIndex(VOCABULARY)
+    assert index.lookup("helo") == "hello"
+    assert index.lookup("hellooo") == "hello"
+    assert index.lookup("watre") == "water"
+    assert index.lookup("skool") == "school"
+    assert index.lookup("xyzzy") is None
+
+
+def test_short_words_get_fewer_edits():
+    index = FuzzyIndex(VOCABULARY)
+    assert index.lookup("nw") is None  # two letters: no correction
+    assert index.lookup("wlk") == "walk"  # up to four letters: one edit
+    assert index.lookup("wk") is None
+    assert index.lookup("hapy") == "happy"
+    assert index.lookup("hpy") is None
+
+
+def test_ties_prefer_dropped_letters_then_rank():
+    index = FuzzyIndex(VOCABULARY)
+    # "coll" is one substitution from both "cool" and "call"; "cool" ranks first
+    assert index.lookup("coll") == "cool"
+    # "helpo" is one edit from "help" (a doubled letter) and from "hello" (a substitution)
+    assert index.lookup("helpo") == "help"
+
+
+def test_multi_word_and_non_alpha_entries_are_skipped():
+    index = FuzzyIndex({"thank you": 0, "r2d2": 1, "hello": 2})
+    assert set(index.ranks) == {"hello"}
+    assert index.lookup("thank yu") is None
+
+
+def test_max_distance_zero_disables_correction():
+    assert FuzzyIndex(VOCABULARY, max_distance=0).lookup("helo") is None
+
+
+def test_common_words_are_not_corrected():
+    index = FuzzyIndex({"wash": 0, "hat": 1, "area": 2, "bee": 3, "where": 4, "cold": 5})
+    for word in ["was", "has", "are", "been", "were", "could"]:
+        assert index.lookup(word) is None
+    assert index.lookup("waash") == "wash"
+
+
+def test_no_common_word_is_corrected_with_the_class_list():
+    if not os.path.exists(CLASS_LIST):
+        pytest.skip("class list not available")
+    vocabulary = load_class_list(CLASS_LIST)
+    index = FuzzyIndex(vocabulary)
+    corrected = {word: index.lookup(word) for word in COMMON_WORDS if word not in vocabulary}
+    assert {word: match for word, match in corrected.items() if match} == {}
+    assert index.lookup("helo") == "hello"
@@ -0,0 +1,32 @@
+from gloss_trie import GlossTrie, tokenize
+
+
+def test_tokenize_normalizes_like_the_class_list():
+    assert tokenize("Thank-you, Mother!") == ["thankyou", "mother"]
+    assert tokenize("  I   want\twater ") == ["i", "want", "water"]
+
+
+def test_longest_match_wins():
+    trie = GlossTrie(["thank", "thank you", "you", "thank you very much", "very"])
+    tokens = tokenize("thank you very much")
+    assert trie.segment(tokens) == [(0, 4, "thank you very much")]
+    tokens = tokenize("thank you very")
+    assert trie.segment(tokens) == [(0, 2, "thank you"), (2, 3, "very")]
+
+
+def test_falls_back_to_the_last_complete_match():
+    # "thank you very" is a path in the trie but not an entry, so "thank you" is used
+    trie = GlossTrie(["thank you", "thank you very much", "good"])
+    assert trie.segment(tokenize("thank you very good")) == [(0, 2, "thank you"), (2, 3, None), (3, 4, "good")]
+
+
+def test_unmatched_tokens_are_single_spans():
+    trie = GlossTrie(["hello"])
+    assert trie.segment(["foo", "hello", "bar"]) == [(0, 1, None), (1, 2, "hello"), (2, 3, None)]
+    assert trie.segment([]) == []
+
+
+def test_first_entry_wins_for_the_same_tokens():
+    trie = GlossTrie(["Thank You", "thank you", ""])
+    assert trie.segment(["thank", "you"]) == [(0, 2, "Thank You")]
+    assert trie.max_depth == 2
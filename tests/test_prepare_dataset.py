@@ -0,0 +1,36 @@
+import json
+import os
+from prepare_dataset import save_shards
+
+WLASL_DATA = [{"gloss": word, "instances": []} for word in
+              ["book", "drink", "computer", "apple", "chair", "go", "before", "who", "candy", "deaf", "unlisted"]]
+VALID_WORDS = {entry["gloss"] for entry in WLASL_DATA} - {"unlisted"}
+
+
+def read_shards(shards):
+    pairs = []
+    for path, count in shards:
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == count
+        pairs.extend(lines)
+    return pairs
+
+
+def test_shards_are_reproducible(tmp_path):
+    first = read_shards(save_shards(WLASL_DATA, VALID_WORDS, str(tmp_path / "a"), num_shards=3, seed=7, processes=2))
+    second = read_shards(save_shards(WLASL_DATA, VALID_WORDS, str(tmp_path / "b"), num_shards=3, seed=7, processes=2))
+    assert first == second
+
+    single_words = [pair for pair in first if " " not in pair["gloss"]]
+    # Three templates per word, except "a {word}" before a vowel ("apple")
+    assert len(single_words) == 9 * 3 + 2
+    assert {pair["gloss"] for pair in single_words} == {word.upper() for word in VALID_WORDS}
+
+
+def test_rerun_with_fewer_shards_removes_stale_ones(tmp_path):
+    output_dir = str(tmp_path)
+    save_shards(WLASL_DATA, VALID_WORDS, output_dir, num_shards=5, processes=2)
+    shards = save_shards(WLASL_DATA, VALID_WORDS, output_dir, num_shards=2, processes=2)
+    assert sorted(os.listdir(output_dir)) == sorted(os.path.basename(path) for path, _ in shards)
+    assert len(shards) == 2
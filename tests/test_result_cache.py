@@ -0,0 +1,112 @@
+import os
+import pytest
+from result_cache import ResultCache
+
+
+def make_result(text):
+    return {'text': text, 'videos': [f"{text}.mp4"]}
+
+
+def test_local_tier_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.set_version('v1')
+    cache.put('a', make_result('a'))
+    cache.put('b', make_result('b'))
+    cache.get('a')
+    cache.put('c', make_result('c'))
+
+    assert cache.get('b') is None
+    assert cache.get('a') == make_result('a')
+    assert cache.get('c') == make_result('c')
+    assert cache.stats()['entries'] == 2
+
+
+def test_get_returns_a_copy():
+    cache = ResultCache()
+    cache.set_version('v1')
+    cache.put('a', make_result('a'))
+    cache.get('a')['text'] = 'changed'
+    assert cache.get('a') == make_result('a')
+
+
+def test_shared_tier_serves_other_instances_and_evicted_keys(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    first = ResultCache(max_entries=1, shared_path=path)
+    second = ResultCache(max_entries=1, shared_path=path)
+    for cache in (first, second):
+        cache.set_version('v1')
+
+    first.put('a', make_result('a'))
+    first.put('b', make_result('b'))  # Evicts 'a' from first's local tier
+
+    assert first.get('a') == make_result('a')
+    assert second.get('b') == make_result('b')
+    assert first.stats()['shared_hits'] == 1
+    assert second.stats()['shared_hits'] == 1
+
+    # Shared hits are promoted to the local tier
+    assert second.get('b') == make_result('b')
+    assert second.stats()['hits'] == 1
+
+
+def test_new_version_hides_older_entries_in_both_tiers(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    first = ResultCache(shared_path=path)
+    first.set_version('v1')
+    first.put('a', make_result('a'))
+
+    first.set_version('v2')
+    assert first.get('a') is None
+    assert first.stats()['misses'] == 1
+
+
+def test_workers_on_different_versions_keep_each_others_rows(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    old, new = ResultCache(shared_path=path), ResultCache(shared_path=path)
+    old.set_version('v1')
+    old.put('a', make_result('a'))
+    new.set_version('v2')
+    new.put('a', make_result('b'))
+
+    # Switching versions does not delete the rows a worker still on v1 uses
+    other = ResultCache(shared_path=path)
+    other.set_version('v1')
+    assert other.get('a') == make_result('a')
+    other.set_version('v2')
+    assert other.get('a') == make_result('b')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork()")
+def test_forked_child_opens_its_own_connection(tmp_path):
+    cache = ResultCache(shared_path=str(tmp_path / 'cache.sqlite'))
+    cache.set_version('v1')
+    cache.put('parent', make_result('parent'))
+    parent_conn = cache._connection()
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            child_conn = cache._connection()
+            cache.put('child', make_result('child'))
+            ok = child_conn is not parent_conn and cache.get('parent') == make_result('parent')
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WEXITSTATUS(status) == 0
+    assert cache._connection() is parent_conn
+    cache._entries.clear()
+    assert cache.get('child') == make_result('child')
+
+
+def test_close_reopens_on_next_use(tmp_path):
+    cache = ResultCache(shared_path=str(tmp_path / 'cache.sqlite'))
+    cache.set_version('v1')
+    cache.put('a', make_result('a'))
+    conn = cache._connection()
+
+    cache.close()
+    cache._entries.clear()
+    assert cache.get('a') == make_result('a')
+    assert cache._connection() is not conn
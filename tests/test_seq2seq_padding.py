@@ -0,0 +1,16 @@
+import pytest
+
+
+def test_padding_does_not_change_encoder_states():
+    tf = pytest.importorskip("tensorflow")
+    np = pytest.importorskip("numpy")
+    from train_text_to_gloss import build_inference_models, build_seq2seq_model
+
+    model = build_seq2seq_model(50, embedding_dim=8, hidden_units=8, max_length=None, dropout_rate=0.0)
+    encoder, _ = build_inference_models(model)
+    sentence = [[3, 4, 5]]
+    bucket_padded = np.array(sentence)
+    serve_padded = np.array([sentence[0] + [0] * 17])
+
+    for bucket_state, serve_state in zip(encoder(bucket_padded), encoder(serve_padded)):
+        np.testing.assert_allclose(np.asarray(bucket_state), np.asarray(serve_state), atol=1e-5)
@@ -0,0 +1,91 @@
+import json
+import os
+import pytest
+from snapshot import EntryTable, build_snapshot, load_class_list, load_entries, load_snapshot
+
+WLASL = [
+    {"gloss": "book", "instances": [{"video_id": "69241"}, {"video_id": 7}]},
+    {"gloss": "drink", "instances": []},
+    {"gloss": "thank you", "instances": [{"video_id": "57000"}]},
+]
+
+
+@pytest.fixture
+def sources(tmp_path):
+    json_path = tmp_path / "WLASL_v0.3.json"
+    json_path.write_text(json.dumps(WLASL))
+    class_list_path = tmp_path / "wlasl_class_list.txt"
+    class_list_path.write_text("0\tbook\n1\tdrink\n2\tthank you\n")
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    (video_dir / "69241.mp4").write_bytes(b"x")
+    (video_dir / "57000.mp4").write_bytes(b"y")
+    return [str(json_path), str(video_dir), str(class_list_path), str(tmp_path / "snapshot.sqlite")]
+
+
+def test_entry_table():
+    table = EntryTable([("book", ["1", "22"]), ("drink", []), ("go", ["333"])])
+    assert len(table) == 3
+    assert list(table) == [("book", ["1", "22"]), ("drink", []), ("go", ["333"])]
+    assert table[0] == ("book", ["1", "22"])
+    assert table[-1] == ("go", ["333"])
+    assert table.video_ids(1) == []
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_load_class_list_and_entries(sources):
+    json_path, _, class_list_path, _ = sources
+    assert load_class_list(class_list_path) == {"book": 0, "drink": 1, "thank you": 2}
+    assert list(load_entries(json_path)) == [("book", ["69241", "7"]), ("drink", []), ("thank you", ["57000"])]
+
+
+def test_round_trip(sources):
+    json_path, video_dir, class_list_path, snapshot_path = sources
+    build_snapshot(*sources)
+    assert not os.path.exists(snapshot_path + ".tmp")
+
+    snapshot = load_snapshot(snapshot_path, json_path, video_dir, class_list_path)
+    assert snapshot["word_to_index"] == load_class_list(class_list_path)
+    assert list(snapshot["entries"]) == list(load_entries(json_path))
+    assert snapshot["available"] == {"69241.mp4", "57000.mp4"}
+
+
+def test_missing_sources_trust_the_snapshot(sources):
+    json_path, video_dir, class_list_path, snapshot_path = sources
+    build_snapshot(*sources)
+    os.remove(json_path)
+    os.remove(class_list_path)
+    assert load_snapshot(snapshot_path, json_path, video_dir, class_list_path) is not None
+
+
+def test_changed_sources_invalidate_the_snapshot(sources):
+    json_path, video_dir, class_list_path, snapshot_path = sources
+    assert load_snapshot(snapshot_path, json_path, video_dir, class_list_path) is None
+    build_snapshot(*sources)
+
+    # Touching a source without changing it keeps the snapshot (the hash still matches)
+    os.utime(class_list_path, ns=(0, 0))
+    assert load_snapshot(snapshot_path, json_path, video_dir, class_list_path) is not None
+
+    with open(class_list_path, "a") as f:
+        f.write("3\tgo\n")
+    assert load_snapshot(snapshot_path, json_path, video_dir, class_list_path) is None
+
+
+def test_new_video_drops_only_the_listing(sources):
+    json_path, video_dir, class_list_path, snapshot_path = sources
+    build_snapshot(*sources)
+    with open(os.path.join(video_dir, "00001.mp4"), "wb") as f:
+        f.write(b"z")
+    os.utime(video_dir, ns=(1, 1))
+    snapshot = load_snapshot(snapshot_path, json_path, video_dir, class_list_path)
+    assert snapshot["available"] is None
+    assert snapshot["word_to_index"] == load_class_list(class_list_path)
+
+
+def test_corrupt_snapshot_is_ignored(sources):
+    json_path, video_dir, class_list_path, snapshot_path = sources
+    with open(snapshot_path, "wb") as f:
+        f.write(b"not a database" * 100)
+    assert load_snapshot(snapshot_path, json_path, video_dir, class_list_path) is None
@@ -0,0 +1,48 @@
+import os
+import pytest
+from stitching import SentenceStitcher
+
+
+@pytest.fixture
+def stitcher(tmp_path):
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    for name in ["1.mp4", "2.mp4"]:
+        (video_dir / name).write_bytes(b"clip")
+    return SentenceStitcher(str(video_dir), str(tmp_path / "cache"), max_cache_bytes=10)
+
+
+def test_cache_key_changes_with_the_clips(stitcher):
+    key = stitcher.cache_key(["1.mp4", "2.mp4"])
+    assert stitcher.cache_key(["2.mp4", "1.mp4"]) != key
+    with open(os.path.join(stitcher.video_dir, "1.mp4"), "wb") as f:
+        f.write(b"a new clip")
+    assert stitcher.cache_key(["1.mp4", "2.mp4"]) != key
+    with pytest.raises(FileNotFoundError):
+        stitcher.cache_key(["3.mp4"])
+
+
+def test_cache_key_uses_recorded_hashes_without_stat(stitcher, monkeypatch):
+    recorded = {os.path.join(stitcher.video_dir, "1.mp4"): "sha-1", os.path.join(stitcher.video_dir, "2.mp4"): "sha-2"}
+    stitcher.signatures = recorded.get
+    key = stitcher.cache_key(["1.mp4", "2.mp4"])
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("cache_key stat'ed a clip")
+    monkeypatch.setattr(os, "stat", no_stat)
+    assert stitcher.cache_key(["1.mp4", "2.mp4"]) == key
+    recorded[os.path.join(stitcher.video_dir, "2.mp4")] = "sha-2b"
+    assert stitcher.cache_key(["1.mp4", "2.mp4"]) != key
+
+
+def test_eviction_keeps_the_file_just_built(stitcher):
+    paths = []
+    for name in ["old.mp4", "older.mp4", "new.mp4"]:
+        path = os.path.join(stitcher.cache_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"12345678")
+        paths.append(path)
+    # On a filesystem with coarse mtimes the file just built can sort first
+    os.utime(paths[2], ns=(0, 0))
+    stitcher._evict(keep=paths[2])
+    assert [os.path.exists(path) for path in paths] == [False, False, True]
@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from tokenization import END_TOKEN, START_TOKEN, pad_sequences, texts_to_sequences  # noqa: E402
+
+WORD_INDEX = {"<OOV>": 1, "i": 2, "want": 3, "water": 4, "rare": 5}
+SENTENCES = ["I want water!", "i want zebra", "rare water", "zebra"]
+
+
+def test_unknown_and_out_of_range_words_become_oov():
+    assert texts_to_sequences(WORD_INDEX, SENTENCES, num_words=5) == [[2, 3, 4], [2, 3, 1], [1, 4], [1]]
+
+
+def test_unknown_words_are_dropped_without_oov_token():
+    word_index = {word: index for word, index in WORD_INDEX.items() if word != "<OOV>"}
+    assert texts_to_sequences(word_index, SENTENCES) == [[2, 3, 4], [2, 3], [5, 4], []]
+
+
+def test_pad_sequences_keeps_the_last_words():
+    padded = pad_sequences([[1, 2, 3, 4], [5]], maxlen=3)
+    assert padded.tolist() == [[2, 3, 4], [5, 0, 0]]
+
+
+def test_string_model_encodes_like_the_python_path():
+    tf = pytest.importorskip("tensorflow")
+    from export_string_model import StringToGlossModule
+    from train_text_to_gloss import build_seq2seq_model
+
+    gloss_index = {"<OOV>": 1, START_TOKEN: 2, END_TOKEN: 3, "WATER": 4}
+    model = build_seq2seq_model(5, embedding_dim=8, hidden_units=8, max_length=None, num_decoder_words=5)
+    module = StringToGlossModule(model, WORD_INDEX, gloss_index, max_length=20)
+
+    in_graph = module._encode(tf.constant(SENTENCES)).numpy()
+    python = pad_sequences(texts_to_sequences(WORD_INDEX, SENTENCES, num_words=5), 20)
+    assert in_graph.tolist() == python.tolist()
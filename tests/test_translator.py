@@ -0,0 +1,53 @@
+import json
+import os
+import pytest
+from predict import WLASLRetrieval
+from result_cache import ResultCache
+from translator import Translator
+
+WLASL = [
+    {"gloss": "hello", "instances": [{"video_id": "00001"}]},
+    {"gloss": "thank you", "instances": [{"video_id": "00002"}]},
+    {"gloss": "mother", "instances": [{"video_id": "00003"}]},
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "WLASL_v0.3.json").write_text(json.dumps(WLASL))
+    (tmp_path / "wlasl_class_list.txt").write_text("0\thello\n1\tthank you\n2\tmother\n")
+    (tmp_path / "videos").mkdir()
+    (tmp_path / "videos" / "00001.mp4").write_bytes(b"x")
+    (tmp_path / "videos" / "00002.mp4").write_bytes(b"x")
+    return tmp_path
+
+
+def make_translator(data_dir, shared_path):
+    retriever = WLASLRetrieval(str(data_dir / "WLASL_v0.3.json"), str(data_dir / "videos"),
+                               str(data_dir / "wlasl_class_list.txt"))
+    retriever.watch.interval = 0
+    return Translator(retriever, synonym_index={}, cache=ResultCache(16, shared_path))
+
+
+def test_segments_multi_word_entries(data_dir):
+    translator = make_translator(data_dir, None)
+    result = translator.translate("Thank you, mother")
+    assert result['text'] == "thank you mother"
+    assert result['videos'] == ["00002.mp4"]
+    assert result['mappings'] == {"thank you": "thank you", "mother": "mother"}
+    assert result['clips'] == [{'video': "00002.mp4", 'word': "thank you", 'gloss': "thank you"}]
+
+
+def test_every_worker_sees_new_clips(data_dir):
+    shared_path = str(data_dir / "cache.sqlite")
+    refreshed, other = make_translator(data_dir, shared_path), make_translator(data_dir, shared_path)
+    assert other.translate("hello mother")['videos'] == ["00001.mp4"]
+    version = other.cache.version
+
+    (data_dir / "videos" / "00003.mp4").write_bytes(b"x")
+    refreshed.retriever.refresh()
+    assert refreshed.translate("hello mother")['videos'] == ["00001.mp4", "00003.mp4"]
+
+    # The worker that did not handle the refresh notices the new clip and moves to the same version
+    assert other.translate("hello mother")['videos'] == ["00001.mp4", "00003.mp4"]
+    assert other.cache.version == refreshed.cache.version != version
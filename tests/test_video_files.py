@@ -0,0 +1,72 @@
+import json
+import os
+from renditions import poster_path, rendition_path, save_rendition_index
+from video_files import ContentHashes, FileWatch
+from video_manifest import MANIFEST_VERSION
+
+
+def write_manifest(path, video_dir, names):
+    videos = {}
+    for name in names:
+        stat = os.stat(os.path.join(video_dir, name))
+        videos[name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': f"sha-{name}"}
+    with open(path, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'fingerprint': '', 'videos': videos}, f)
+
+
+def test_file_watch(tmp_path):
+    path = tmp_path / "manifest.json"
+    watch = FileWatch([str(path), None], interval=0)
+    assert not watch.changed()
+    path.write_text("{}")
+    assert watch.changed()
+    assert not watch.changed()
+
+    throttled = FileWatch([str(path)], interval=60)
+    path.write_text("{ }")
+    assert not throttled.changed()
+
+
+def test_hashes_come_from_the_manifest(tmp_path):
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    (video_dir / "1.mp4").write_bytes(b"one")
+    (video_dir / "2.mp4").write_bytes(b"two")
+    manifest_path = str(tmp_path / "manifest.json")
+    write_manifest(manifest_path, str(video_dir), ["1.mp4"])
+
+    hashes = ContentHashes(str(video_dir), manifest_path, interval=0)
+    assert hashes.get(str(video_dir / "1.mp4")) == "sha-1.mp4"
+    assert hashes.recorded(str(video_dir / "1.mp4")) == "sha-1.mp4"
+    # Not in the manifest: tagged from mtime and size, without reading the file
+    stat = os.stat(video_dir / "2.mp4")
+    assert hashes.get(str(video_dir / "2.mp4")) == f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    assert hashes.recorded(str(video_dir / "2.mp4")) is None
+
+    # A clip changed since the manifest was built is not given its old hash
+    (video_dir / "1.mp4").write_bytes(b"changed")
+    assert hashes.get(str(video_dir / "1.mp4")) != "sha-1.mp4"
+
+    generation = hashes.generation
+    write_manifest(manifest_path, str(video_dir), ["1.mp4", "2.mp4"])
+    assert hashes.get(str(video_dir / "2.mp4")) == "sha-2.mp4"
+    assert hashes.generation == generation + 1
+
+
+def test_hashes_of_renditions_and_posters(tmp_path):
+    rendition_dir = tmp_path / "renditions"
+    small = rendition_path(str(rendition_dir), "1.mp4", "small")
+    poster = poster_path(str(rendition_dir), "1.mp4")
+    for path, content in [(small, b"small"), (poster, b"jpeg")]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+    files = {}
+    for name, path in [('small', small), ('poster', poster)]:
+        stat = os.stat(path)
+        files[name] = [stat.st_mtime_ns, stat.st_size, f"sha-{name}"]
+    save_rendition_index(str(rendition_dir), {"1.mp4": {'mtime_ns': 0, 'size': 0, 'outputs': {}, 'files': files}})
+
+    hashes = ContentHashes(str(tmp_path / "videos"), None, str(rendition_dir))
+    assert hashes.get(small) == "sha-small"
+    assert hashes.get(poster) == "sha-poster"
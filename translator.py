@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import os
+import time
+from fuzzy import COMMON_WORDS, FuzzyIndex
+from gloss_trie import tokenize
+from metrics import STAGE_SECONDS
+from predict import WLASLRetrieval
+from result_cache import ResultCache
+from synonyms import best_synonym, load_synonym_index, vocabulary_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump this when the result fields change so cached results of the old shape are not returned
+RESULT_FORMAT = 2
+
+class Translator:
+    def __init__(self, retriever, synonym_index=None, fuzzy_index=None, cache=None):
+        """
+        Maps English text to sign videos using a WLASLRetrieval.
+        Without a synonym index, synonyms are looked up in WordNet.
+        With a fuzzy index, misspelled words that match nothing else are corrected.
+        With a ResultCache, results are reused for texts that normalize the same way.
+        """
+        self.retriever = retriever
+        self.synonym_index = synonym_index
+        self.fuzzy_index = fuzzy_index
+        self.cache = cache
+        self._versioned_index = None
+
+    def version(self):
+        """
+        Fingerprint of everything a result depends on: the vocabulary, the
+        matching stages and the gloss -> video index.
+        """
+        digest = hashlib.sha256(vocabulary_hash(self.retriever.word_to_index).encode('utf-8'))
+        digest.update(f"format {RESULT_FORMAT}\n".encode('utf-8'))
+        digest.update(f"{self.synonym_index is not None}:{self.fuzzy_index and self.fuzzy_index.max_distance}".encode('utf-8'))
+        if self.fuzzy_index is not None:
+            digest.update(' '.join(sorted(COMMON_WORDS)).encode('utf-8'))
+        for gloss, path in sorted(self.retriever.video_index.items()):
+            digest.update(f"\n{gloss}:{os.path.basename(path)}".encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def _sync_cache_version(self):
+        """
+        retriever.refresh() swaps in a new video index, which moves the cache to a new version.
+        The version is computed from the index itself, so every worker that sees the
+        same files arrives at the same version.
+        """
+        video_index = self.retriever.video_index
+        if video_index is not self._versioned_index:
+            self.cache.set_version(self.version())
+            self._versioned_index = video_index
+
+    def find_matching_word(self, word):
+        """Find a matching word or its synonym in the vocabulary"""
+        return self.match_word(word)[0]
+
+    def match_word(self, word):
+        """
+        Runs the matching stages in order: exact, synonym, then fuzzy.
+        Returns (matched word or None, True if it was a fuzzy correction).
+        """
+        word = word.lower()
+        available_words = self.retriever.word_to_index
+        # First try exact match
+        if word in available_words:
+            return word, False
+
+        # Then try synonyms
+        if self.synonym_index is not None:
+            synonym = self.synonym_index.get(word)
+        else:
+            synonym = best_synonym(word, available_words)
+        if synonym is not None:
+            # '' marks words that are dropped on purpose, so they are not corrected either
+            return synonym or None, False
+
+        # Finally try a spelling correction
+        if self.fuzzy_index is not None:
+            correction = self.fuzzy_index.lookup(word)
+            if correction:
+                return correction, True
+        return None, False
+
+    def translate(self, text):
+        """
+        Translates one text.
+        Returns: {"text": ..., "videos": [...], "clips": [...], "count": ..., "mappings": {...}, "corrections": {...}}
+        clips has one {"video", "word", "gloss"} per video: the input word or
+        phrase and the vocabulary entry it matched.
+        corrections holds the subset of mappings that were fuzzy spelling corrections.
+        """
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        """
+        Translates several texts, resolving each distinct word only once.
+        Each text is segmented into the longest vocabulary matches (so multi-word
+        entries match); only the words left over are looked up as synonyms.
+        Returns one result per text, in the same shape as translate().
+        Per-text stage timings are recorded in metrics.STAGE_SECONDS.
+        """
+        # Workers other than the one that handled /refresh-videos see new clips here
+        self.retriever.refresh_if_changed()
+        if self.cache is not None:
+            self._sync_cache_version()
+
+        resolved = {}  # word or matched phrase -> (matched word, video filename, corrected)
+        results = []
+        for text in texts:
+            started = time.perf_counter()
+            tokens = tokenize(text)
+            # Results depend only on the normalized tokens
+            key = ' '.join(tokens)
+            normalized = time.perf_counter()
+            STAGE_SECONDS.observe(normalized - started, 'translate', 'normalize')
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                STAGE_SECONDS.observe(time.perf_counter() - normalized, 'translate', 'cache')
+                if cached is not None:
+                    results.append(cached)
+                    continue
+
+            matched_words = []
+            videos = []
+            clips = []
+            original_to_matched = {}  # Map original words to their matches
+            corrections = {}
+
+            segment_started = time.perf_counter()
+            spans = self.retriever.trie.segment(tokens)
+            match_time = lookup_time = 0.0
+            segmented = time.perf_counter()
+            STAGE_SECONDS.observe(segmented - segment_started, 'translate', 'segment')
+
+            for start, end, entry in spans:
+                word = ' '.join(tokens[start:end])
+                if word not in resolved:
+                    stage_started = time.perf_counter()
+                    matched_word, corrected = (entry, False) if entry is not None else self.match_word(word)
+                    matched = time.perf_counter()
+                    path = self.retriever.get_video_path(matched_word) if matched_word else None
+                    resolved[word] = (matched_word, os.path.basename(path) if path else None, corrected)
+                    match_time += matched - stage_started
+                    lookup_time += time.perf_counter() - matched
+
+                matched_word, video, corrected = resolved[word]
+                if matched_word:
+                    matched_words.append(matched_word)
+                    original_to_matched[word] = matched_word
+                    if corrected:
+                        corrections[word] = matched_word
+                if video:
+                    videos.append(video)
+                    clips.append({'video': video, 'word': word, 'gloss': matched_word})
+
+            result = {
+                'text': ' '.join(matched_words),
+                'videos': videos,
+                'clips': clips,
+                'count': len(videos),
+                'mappings': original_to_matched,
+                'corrections': corrections
+            }
+            STAGE_SECONDS.observe(match_time, 'translate', 'match')
+            STAGE_SECONDS.observe(lookup_time, 'translate', 'video_lookup')
+            if self.cache is not None:
+                self.cache.put(key, result)
+            results.append(result)
+        return results
+
+def load_translator(json_path, video_dir, class_list_path, snapshot_path=None, synonym_index_path=None,
+                    manifest_path=None, selection='first', fuzzy_distance=2, cache_size=4096, shared_cache_path=None):
+    """
+    Builds a Translator from the WLASL data files.
+    fuzzy_distance is the maximum spelling correction distance (0 disables correction).
+    cache_size is the number of results kept in memory (0 disables the cache);
+    shared_cache_path adds a sqlite tier shared by all processes on the host.
+    """
+    retriever = WLASLRetrieval(json_path, video_dir, class_list_path, snapshot_path, manifest_path, selection)
+    synonym_index = None
+    if synonym_index_path:
+        synonym_index = load_synonym_index(synonym_index_path, retriever.word_to_index.keys())
+        if synonym_index is None:
+            logger.warning("Synonym index missing or stale, falling back to WordNet")
+    fuzzy_index = FuzzyIndex(retriever.word_to_index, fuzzy_distance) if fuzzy_distance > 0 else None
+    cache = ResultCache(cache_size, shared_cache_path) if cache_size > 0 else None
+    return Translator(retriever, synonym_index, fuzzy_index, cache)
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from renditions import load_rendition_index, poster_path, rendition_path
+from video_manifest import load_manifest
+
+class FileWatch:
+    def __init__(self, paths, interval=1.0):
+        """
+        Notices when any of a few files or directories is created, removed or
+        modified (mtime or size). Each path is stat'ed at most once per
+        interval seconds, so changed() is cheap enough to call per request.
+        """
+        self.paths = [path for path in paths if path]
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._signature = self._read()
+        self._checked = time.monotonic()
+
+    def _read(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return signature
+
+    def changed(self):
+        """True once after any path changed since the previous call."""
+        if time.monotonic() - self._checked < self.interval:
+            return False
+        with self._lock:
+            if time.monotonic() - self._checked < self.interval:
+                return False
+            self._checked = time.monotonic()
+            signature = self._read()
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            return True
+
+class ContentHashes:
+    def __init__(self, video_dir=None, manifest_path=None, rendition_dir=None, interval=1.0):
+        """
+        sha256 of each clip, rendition and poster, used as strong ETags.
+        The hashes are computed offline by video_manifest.py and renditions.py
+        and only looked up here, so a request never reads a file to hash it.
+        Files missing from both indexes, or changed since, get a tag made from
+        their mtime and size. The indexes are reloaded when they change
+        (checked at most once per interval seconds).
+        """
+        self.video_dir = video_dir
+        self.manifest_path = manifest_path
+        self.rendition_dir = rendition_dir
+        self.generation = 0  # Incremented whenever the hashes are reloaded
+        self._hashes = {}  # path -> (mtime_ns, size, sha256)
+        self._lock = threading.Lock()
+        index_path = os.path.join(rendition_dir, 'index.json') if rendition_dir else None
+        self.watch = FileWatch([manifest_path, index_path], interval)
+        self.reload()
+
+    def reload(self):
+        """Reads the hashes recorded in the video manifest and the rendition index."""
+        hashes = {}
+        manifest = load_manifest(self.manifest_path) if self.manifest_path else None
+        if manifest:
+            for filename, info in manifest['videos'].items():
+                hashes[os.path.join(self.video_dir, filename)] = (info['mtime_ns'], info['size'], info['sha256'])
+        index = load_rendition_index(self.rendition_dir) if self.rendition_dir else None
+        if index:
+            for video_id, info in index['videos'].items():
+                for name, recorded in info.get('files', {}).items():
+                    path = (poster_path(self.rendition_dir, video_id) if name == 'poster'
+                            else rendition_path(self.rendition_dir, video_id, name))
+                    hashes[path] = tuple(recorded)
+        with self._lock:
+            self._hashes = hashes
+            self.generation += 1
+
+    def reload_if_changed(self):
+        if self.watch.changed():
+            self.reload()
+
+    def get(self, path, stat=None):
+        """
+        Returns the recorded sha256 hex digest of a file's content, or a tag
+        made from its mtime and size if no hash is recorded for this version.
+        """
+        self.reload_if_changed()
+        stat = stat or os.stat(path)
+        recorded = self._hashes.get(path)
+        if recorded and recorded[:2] == (stat.st_mtime_ns, stat.st_size):
+            return recorded[2]
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def recorded(self, path):
+        """The sha256 recorded for a file without checking the file itself, or None."""
+        self.reload_if_changed()
+        recorded = self._hashes.get(path)
+        return recorded[2] if recorded else None
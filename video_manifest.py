@@ -0,0 +1,117 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+# Bump this whenever the entry fields change so old manifests are re-probed
+MANIFEST_VERSION = 1
+
+
+def probe_video(path):
+    """
+    Returns size, mtime, content hash, duration and resolution of one clip.
+    Duration and resolution are None when ffprobe is not installed.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+
+    entry = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest.hexdigest(),
+        'duration': None,
+        'width': None,
+        'height': None,
+    }
+    if shutil.which('ffprobe'):
+        result = subprocess.run([
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'format=duration:stream=width,height', '-of', 'json', path
+        ], capture_output=True, text=True)
+        if result.returncode == 0:
+            info = json.loads(result.stdout)
+            stream = (info.get('streams') or [{}])[0]
+            duration = info.get('format', {}).get('duration')
+            entry['duration'] = float(duration) if duration else None
+            entry['width'] = stream.get('width')
+            entry['height'] = stream.get('height')
+    return entry
+
+
+def manifest_fingerprint(videos):
+    """
+    Short hash of the video set and contents; changes whenever a clip is added, removed or edited.
+    """
+    digest = hashlib.sha256()
+    for filename in sorted(videos):
+        digest.update(f"{filename}:{videos[filename]['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def load_manifest(manifest_path):
+    """
+    Loads a manifest written by scan_videos, or returns None if it is missing or from another version.
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def scan_videos(video_dir, manifest_path, workers=8):
+    """
+    Scans video_dir and writes the manifest. Only clips whose mtime or size
+    changed since the previous manifest are probed again.
+    """
+    previous = load_manifest(manifest_path)
+    previous_videos = previous['videos'] if previous else {}
+
+    videos = {}
+    to_probe = []
+    with os.scandir(video_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith('.mp4'):
+                continue
+            stat = entry.stat()
+            old = previous_videos.get(entry.name)
+            if old and old['mtime_ns'] == stat.st_mtime_ns and old['size'] == stat.st_size:
+                videos[entry.name] = old
+            else:
+                to_probe.append(entry.name)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        probed = pool.map(probe_video, [os.path.join(video_dir, name) for name in to_probe])
+        for name, entry in zip(to_probe, probed):
+            videos[name] = entry
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'fingerprint': manifest_fingerprint(videos),
+        'videos': dict(sorted(videos.items())),
+    }
+    # Write to a temporary file and swap it in so readers never see a partial manifest
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return manifest, len(to_probe)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or update the video manifest")
+    parser.add_argument("--video-dir", default=r"wlasl_data/new_refined_videos")
+    parser.add_argument("--manifest", default=r"wlasl_data/video_manifest.json")
+    parser.add_argument("--workers", type=int, default=8, help="number of probing threads")
+    args = parser.parse_args()
+
+    manifest, probed = scan_videos(args.video_dir, args.manifest, args.workers)
+    print(f"Manifest has {len(manifest['videos'])} videos ({probed} probed), saved as {args.manifest}")